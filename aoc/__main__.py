@@ -0,0 +1,60 @@
+import argparse
+import sys
+
+from aoc import bench, generators, runner
+
+
+def parse_scales(spec: str):
+    return [int(s) for s in spec.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='aoc', description='Advent of Code 2020 solutions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='solve days in parallel and report per-part timings')
+    run_parser.add_argument('--days', default='2-25', help="days to run, e.g. '2-25' or '5,7,10-12'")
+    run_parser.add_argument('--jobs', type=int, default=None, help='number of worker processes (default: CPU count)')
+
+    generate_parser = subparsers.add_parser('generate', help='write synthetic inputs at several scales')
+    generate_parser.add_argument('--days', default='2-25')
+    generate_parser.add_argument('--scales', default=','.join(map(str, generators.DEFAULT_SCALES)))
+    generate_parser.add_argument('--input-dir', default=bench.DEFAULT_INPUT_DIR)
+    generate_parser.add_argument('--seed', type=int, default=generators.DEFAULT_SEED)
+
+    bench_parser = subparsers.add_parser('bench', help='benchmark every part on synthetic inputs')
+    bench_parser.add_argument('--days', default='2-25')
+    bench_parser.add_argument('--scales', default='1,10', help="comma separated input scales, e.g. '1,10,100'")
+    bench_parser.add_argument('--input-dir', default=bench.DEFAULT_INPUT_DIR)
+    bench_parser.add_argument('--seed', type=int, default=generators.DEFAULT_SEED)
+    bench_parser.add_argument('--timeout', type=float, default=bench.DEFAULT_TIMEOUT, help='seconds allowed per part')
+    bench_parser.add_argument('--output', default='bench_results.json', help='where to write the results')
+    bench_parser.add_argument('--baseline', help='results file to check for regressions against')
+    bench_parser.add_argument('--threshold', type=float, default=bench.DEFAULT_THRESHOLD,
+                              help='relative slowdown that counts as a regression')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results, total_wall_time = runner.run(runner.parse_days(args.days), args.jobs)
+        print(runner.format_results(results, total_wall_time))
+    elif args.command == 'generate':
+        for day in runner.parse_days(args.days):
+            for scale in parse_scales(args.scales):
+                print(generators.write_input(args.input_dir, day, scale, args.seed))
+    elif args.command == 'bench':
+        results = bench.run_benchmarks(
+            runner.parse_days(args.days), parse_scales(args.scales), args.input_dir, args.timeout, args.seed
+        )
+        bench.save_results(results, args.output)
+
+        if args.baseline:
+            regressions = bench.find_regressions(results, bench.load_results(args.baseline), args.threshold)
+            for regression in regressions:
+                print(f'REGRESSION {regression}')
+            if regressions:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
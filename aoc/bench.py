@@ -0,0 +1,140 @@
+import json
+import multiprocessing
+import traceback
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aoc import generators, runner
+
+
+DEFAULT_INPUT_DIR = 'bench_inputs'
+DEFAULT_TIMEOUT = 300
+
+# A part has regressed if it got this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and by at least this many seconds, so timer noise on tiny runs is ignored
+MIN_REGRESSION_SECONDS = 0.05
+
+
+@dataclass
+class BenchmarkResult:
+    day: int
+    part: int
+    scale: int
+    status: str  # 'ok', 'timeout' or 'error'
+    answer: Optional[str] = None
+    wall_time: Optional[float] = None
+    cpu_time: Optional[float] = None
+    peak_rss_kb: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        return self.day, self.part, self.scale
+
+
+def _run_part_worker(connection, day: int, part: int, input_path: str):
+    try:
+        connection.send(('ok', runner.run_part(day, part, input_path)))
+    except Exception:
+        connection.send(('error', traceback.format_exc()))
+
+
+def run_benchmark(day: int, part: int, scale: int, input_path: str, timeout: float) -> BenchmarkResult:
+    # Every benchmark runs on its own in a freshly spawned process, so timings
+    # don't fight over cores and peak RSS only covers that one part
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_part_worker, args=(sender, day, part, input_path))
+    process.start()
+    sender.close()
+
+    try:
+        if not receiver.poll(timeout):
+            return BenchmarkResult(day, part, scale, 'timeout')
+        status, payload = receiver.recv()
+    except EOFError:
+        # The worker died without reporting back (e.g. killed for running out of memory)
+        return BenchmarkResult(day, part, scale, 'error')
+    finally:
+        process.kill()
+        process.join()
+
+    if status == 'error':
+        print(payload)
+        return BenchmarkResult(day, part, scale, 'error')
+
+    return BenchmarkResult(
+        day, part, scale, 'ok',
+        answer=str(payload.answer),
+        wall_time=payload.wall_time,
+        cpu_time=payload.cpu_time,
+        peak_rss_kb=payload.peak_rss_kb,
+    )
+
+
+def run_benchmarks(
+    days: Iterable[int],
+    scales: Iterable[int],
+    input_dir: str = DEFAULT_INPUT_DIR,
+    timeout: float = DEFAULT_TIMEOUT,
+    seed: int = generators.DEFAULT_SEED,
+) -> List[BenchmarkResult]:
+    results = []
+    for day in days:
+        for scale in scales:
+            input_path = generators.write_input(input_dir, day, scale, seed)
+            for part in runner.PARTS:
+                if not runner.get_solution(runner.load_day(day), part):
+                    continue
+
+                result = run_benchmark(day, part, scale, input_path, timeout)
+                print(format_result(result), flush=True)
+                results.append(result)
+
+    return results
+
+
+def save_results(results: List[BenchmarkResult], path: str):
+    with open(path, 'w') as output_file:
+        json.dump([asdict(r) for r in results], output_file, indent=2)
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    with open(path) as input_file:
+        return [BenchmarkResult(**r) for r in json.load(input_file)]
+
+
+def find_regressions(
+    results: List[BenchmarkResult],
+    baseline: List[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    # Returns a description of every benchmark that got slower, broke, or
+    # started giving a different answer compared to the baseline
+    baseline_by_key: Dict[Tuple[int, int, int], BenchmarkResult] = {r.key: r for r in baseline}
+    regressions = []
+
+    for result in results:
+        previous = baseline_by_key.get(result.key)
+        if not previous or previous.status != 'ok':
+            continue
+
+        name = f'day {result.day} part {result.part} at {result.scale}x'
+        if result.status != 'ok':
+            regressions.append(f'{name}: {result.status} (was {previous.wall_time:.3f}s)')
+        elif result.answer != previous.answer:
+            regressions.append(f'{name}: answer changed from {previous.answer} to {result.answer}')
+        elif result.wall_time > previous.wall_time * (1 + threshold) and \
+                result.wall_time - previous.wall_time > MIN_REGRESSION_SECONDS:
+            regressions.append(f'{name}: {previous.wall_time:.3f}s -> {result.wall_time:.3f}s')
+
+    return regressions
+
+
+def format_result(result: BenchmarkResult) -> str:
+    prefix = f'day {result.day:>2} part {result.part} {result.scale:>5}x'
+    if result.status != 'ok':
+        return f'{prefix}  {result.status}'
+
+    return f'{prefix}  {result.wall_time:>9.3f}s wall {result.cpu_time:>9.3f}s cpu {result.peak_rss_kb / 1024:>9.1f} MiB'
@@ -0,0 +1,680 @@
+import os
+import random
+import string
+
+from collections import deque
+from math import isqrt, log10
+from typing import Callable, Dict, List
+
+
+# Scale 1 roughly matches the size of the real puzzle inputs; every other
+# scale multiplies the amount of work the solutions have to do.
+DEFAULT_SCALES = (1, 10, 100, 1000)
+DEFAULT_SEED = 2020
+
+GENERATORS: Dict[int, Callable[[int, random.Random], str]] = {}
+
+
+def generator(day: int):
+    def register(func):
+        GENERATORS[day] = func
+        return func
+    return register
+
+
+def generate_input(day: int, scale: int, seed: int = DEFAULT_SEED) -> str:
+    # Seeded per day/scale, so regenerating an input always gives the same file
+    return GENERATORS[day](scale, random.Random(f'{seed}-{day}-{scale}'))
+
+
+def get_input_path(input_dir: str, day: int, scale: int) -> str:
+    return os.path.join(input_dir, f'day{day}', f'input_{scale}x')
+
+
+def write_input(input_dir: str, day: int, scale: int, seed: int = DEFAULT_SEED) -> str:
+    # Returns the path of the generated input, reusing it if it already exists
+    path = get_input_path(input_dir, day, scale)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as output_file:
+            output_file.write(generate_input(day, scale, seed))
+
+    return path
+
+
+def random_word(rng: random.Random, min_length: int = 3, max_length: int = 7) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(min_length, max_length)))
+
+
+def unique_words(rng: random.Random, count: int, min_length: int = 3, max_length: int = 7) -> List[str]:
+    words = set()
+    while len(words) < count:
+        words.add(random_word(rng, min_length, max_length))
+
+    return sorted(words)
+
+
+def scaled_side(base: int, scale: int) -> int:
+    # Side length of a square-ish area that holds `scale` times as many cells
+    return max(1, round(base * scale ** 0.5))
+
+
+@generator(2)
+def generate_day2(scale: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        password = ''.join(rng.choices(string.ascii_lowercase[:8], k=rng.randint(4, 20)))
+        min_token = rng.randint(1, len(password) - 1)
+        max_token = rng.randint(min_token + 1, len(password))
+        lines.append(f'{min_token}-{max_token} {rng.choice(password)}: {password}')
+
+    return '\n'.join(lines)
+
+
+@generator(3)
+def generate_day3(scale: int, rng: random.Random) -> str:
+    return '\n'.join(
+        ''.join('#' if rng.random() < 0.25 else '.' for _ in range(31))
+        for _ in range(323 * scale)
+    )
+
+
+@generator(4)
+def generate_day4(scale: int, rng: random.Random) -> str:
+    valid_fields = {
+        'byr': lambda: str(rng.randint(1920, 2002)),
+        'iyr': lambda: str(rng.randint(2010, 2020)),
+        'eyr': lambda: str(rng.randint(2020, 2030)),
+        'hgt': lambda: rng.choice([f'{rng.randint(150, 193)}cm', f'{rng.randint(59, 76)}in']),
+        'hcl': lambda: '#' + ''.join(rng.choices('0123456789abcdef', k=6)),
+        'ecl': lambda: rng.choice(['amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth']),
+        'pid': lambda: ''.join(rng.choices(string.digits, k=9)),
+        'cid': lambda: str(rng.randint(100, 350)),
+    }
+    invalid_fields = {
+        'byr': lambda: str(rng.choice([rng.randint(1900, 1919), rng.randint(2003, 2030)])),
+        'iyr': lambda: str(rng.choice([rng.randint(1990, 2009), rng.randint(2021, 2030)])),
+        'eyr': lambda: str(rng.choice([rng.randint(2000, 2019), rng.randint(2031, 2040)])),
+        'hgt': lambda: rng.choice([f'{rng.randint(100, 149)}cm', f'{rng.randint(77, 99)}in', str(rng.randint(50, 190))]),
+        'hcl': lambda: rng.choice(['', '#']) + ''.join(rng.choices('0123456789abcdefz', k=rng.randint(5, 7))),
+        'ecl': lambda: rng.choice(['xry', 'zzz', 'gmt', 'lzr']),
+        'pid': lambda: ''.join(rng.choices(string.digits, k=rng.choice([8, 10]))),
+        'cid': lambda: str(rng.randint(100, 350)),
+    }
+
+    passports = []
+    for _ in range(300 * scale):
+        fields = [f for f in valid_fields if f != 'cid' and rng.random() > 0.05]
+        if rng.random() < 0.6:
+            fields.append('cid')
+        rng.shuffle(fields)
+
+        kvps = [
+            f'{f}:{(invalid_fields if rng.random() < 0.05 else valid_fields)[f]()}'
+            for f in fields
+        ]
+
+        # Spread the fields over a few lines, like the real input
+        lines = []
+        while kvps:
+            count = rng.randint(1, 4)
+            lines.append(' '.join(kvps[:count]))
+            kvps = kvps[count:]
+
+        passports.append('\n'.join(lines))
+
+    return '\n\n'.join(passports)
+
+
+@generator(5)
+def generate_day5(scale: int, rng: random.Random) -> str:
+    # There are only 1024 possible seats, so past the first copy of the plane
+    # the feed repeats boarding passes (e.g. the same flight scanned again).
+    first_seat = rng.randint(8, 100)
+    last_seat = rng.randint(900, 1015)
+    missing_seat = rng.randint(first_seat + 1, last_seat - 1)
+    seat_ids = [s for s in range(first_seat, last_seat + 1) if s != missing_seat] * scale
+    rng.shuffle(seat_ids)
+
+    row_table, column_table = str.maketrans('01', 'FB'), str.maketrans('01', 'LR')
+    return '\n'.join(
+        f'{seat_id >> 3:07b}'.translate(row_table) + f'{seat_id & 7:03b}'.translate(column_table)
+        for seat_id in seat_ids
+    )
+
+
+@generator(6)
+def generate_day6(scale: int, rng: random.Random) -> str:
+    groups = []
+    for _ in range(490 * scale):
+        common = rng.sample(string.ascii_lowercase, rng.randint(0, 6))
+        people = []
+        for _ in range(rng.randint(1, 5)):
+            answers = set(common).union(rng.sample(string.ascii_lowercase, rng.randint(0, 8)))
+            if not answers:
+                answers = {rng.choice(string.ascii_lowercase)}
+            people.append(''.join(rng.sample(sorted(answers), len(answers))))
+        groups.append('\n'.join(people))
+
+    return '\n\n'.join(groups)
+
+
+@generator(7)
+def generate_day7(scale: int, rng: random.Random) -> str:
+    bag_count = 594 * scale
+    names = set()
+    while len(names) < bag_count - 1:
+        name = f'{random_word(rng, 3, 8)} {random_word(rng, 3, 8)}'
+        if 'bag' not in name and name != 'shiny gold':
+            names.add(name)
+
+    # Bags may only contain bags that come after them, which keeps the rules acyclic
+    names = sorted(names)
+    rng.shuffle(names)
+    names.insert(bag_count // 2, 'shiny gold')
+
+    lines = []
+    for idx, name in enumerate(names):
+        remaining = bag_count - idx - 1
+        content_count = min(remaining, rng.choice([0, 1, 1, 2, 2, 3, 4]))
+        if not content_count:
+            lines.append(f'{name} bags contain no other bags.')
+            continue
+
+        # Prefer nearby bags so the containment chains get deep
+        contained_idxs = set()
+        while len(contained_idxs) < content_count:
+            contained_idxs.add(idx + 1 + min(remaining - 1, int(rng.expovariate(1 / 20))))
+
+        contents = []
+        for contained_idx in sorted(contained_idxs):
+            count = rng.randint(1, 5)
+            contents.append(f'{count} {names[contained_idx]} bag{"s" if count > 1 else ""}')
+        lines.append(f'{name} bags contain {", ".join(contents)}.')
+
+    rng.shuffle(lines)
+    return '\n'.join(lines)
+
+
+@generator(8)
+def generate_day8(scale: int, rng: random.Random) -> str:
+    # Lays out a program that terminates by only jumping forwards, then turns
+    # one executed nop into a backwards jump, which makes the program loop and
+    # leaves exactly that instruction to be repaired.
+    length = 650 * scale
+    program = [None] * length
+    executed = []
+
+    def random_instruction(idx: int):
+        # Never executed by the looping program, but keep jumps inside the program
+        return rng.choice(['acc', 'jmp', 'nop']), (rng.randrange(length) - idx) or 1
+
+    idx = 0
+    while idx < length:
+        executed.append(idx)
+        roll = rng.random()
+        if roll < 0.45:
+            program[idx] = 'acc', rng.randint(-50, 50)
+            idx += 1
+        elif roll < 0.7 or idx == 0:
+            program[idx] = 'nop', rng.randint(-min(idx, 500), 500)
+            idx += 1
+        else:
+            offset = min(rng.randint(2, 8), length - idx)
+            program[idx] = 'jmp', offset
+            for skipped_idx in range(idx + 1, idx + offset):
+                program[skipped_idx] = random_instruction(skipped_idx)
+            idx += offset
+
+    corrupted_position = rng.randint(len(executed) // 2, len(executed) - 1)
+    corrupted_idx = executed[corrupted_position]
+    program[corrupted_idx] = 'jmp', executed[rng.randint(0, corrupted_position - 1)] - corrupted_idx
+
+    return '\n'.join(f'{opcode} {arg:+d}' for opcode, arg in program)
+
+
+@generator(9)
+def generate_day9(scale: int, rng: random.Random) -> str:
+    # Every number has to be the sum of two of the previous 25, so the values
+    # grow exponentially with the length of the stream. Building each number
+    # out of the smallest numbers in the window keeps that growth as slow as
+    # possible, but past 10x the numbers are big integers with hundreds of digits.
+    preamble_size = 25
+    length = 1000 * scale
+    nums = rng.sample(range(1, 60), preamble_size)
+
+    while len(nums) < length - 1:
+        smallest = sorted(set(nums[-preamble_size:]))[:4]
+        a, b = rng.sample(smallest, 2)
+        nums.append(a + b)
+
+    # Pick a contiguous range whose sum isn't a pair sum of the final window
+    # (or a number in the stream, which would be a range of length 1)
+    window = set(nums[-preamble_size:])
+    seen_nums = set(nums)
+    while True:
+        start = rng.randint(0, len(nums) - 20)
+        invalid_number = sum(nums[start:start + rng.randint(2, 17)])
+        if invalid_number in seen_nums:
+            continue
+        if not any(invalid_number - n in window and n * 2 != invalid_number for n in window):
+            break
+
+    nums.append(invalid_number)
+    return '\n'.join(map(str, nums))
+
+
+@generator(10)
+def generate_day10(scale: int, rng: random.Random) -> str:
+    joltages = []
+    joltage = 0
+    for _ in range(102 * scale):
+        joltage += rng.choice([1, 1, 1, 3, 3, 2])
+        joltages.append(joltage)
+
+    rng.shuffle(joltages)
+    return '\n'.join(map(str, joltages))
+
+
+def find_oscillating_seats(seats: 'np.ndarray') -> 'np.ndarray':
+    # Runs the part 1 rules and returns the seats that keep flipping back and
+    # forth once the layout stops settling (all False if it settles)
+    import numpy as np
+
+    height, width = seats.shape
+    occupied = np.zeros(seats.shape, dtype=bool)
+    previous = None
+
+    while True:
+        padded = np.pad(occupied, 1).astype(np.int8)
+        neighbors = sum(
+            padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+            if dx or dy
+        )
+        new_occupied = (seats & ~occupied & (neighbors == 0)) | (occupied & (neighbors < 4))
+
+        if (new_occupied == occupied).all():
+            return np.zeros(seats.shape, dtype=bool)
+        if previous is not None and (new_occupied == previous).all():
+            return new_occupied != occupied
+
+        previous, occupied = occupied, new_occupied
+
+
+@generator(11)
+def generate_day11(scale: int, rng: random.Random) -> str:
+    # Random layouts usually end up blinking forever under the part 1 rules
+    # (the real input doesn't), so keep turning a few of the blinking seats
+    # into floor until the layout settles.
+    # numpy is imported here rather than at the top, so that benchmark workers
+    # (which import this module) don't carry it in their peak RSS
+    import numpy as np
+
+    width, height = scaled_side(91, scale), scaled_side(98, scale)
+    np_rng = np.random.default_rng(rng.getrandbits(32))
+    seats = np_rng.random((height, width)) < 0.84
+
+    while (oscillating_seats := find_oscillating_seats(seats)).any():
+        seats &= ~(oscillating_seats & (np_rng.random(seats.shape) < 0.05))
+
+    return '\n'.join(''.join('L' if s else '.' for s in row) for row in seats)
+
+
+@generator(12)
+def generate_day12(scale: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(789 * scale):
+        action = rng.choice('NSEWLRFFF')
+        if action in 'LR':
+            lines.append(f'{action}{rng.choice([90, 90, 180, 270])}')
+        else:
+            lines.append(f'{action}{rng.randint(1, 99)}')
+
+    return '\n'.join(lines)
+
+
+def primes_up_to(limit: int) -> List[int]:
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[:2] = b'\x00\x00'
+    for n in range(2, isqrt(limit) + 1):
+        if sieve[n]:
+            sieve[n * n::n] = bytearray(len(range(n * n, limit + 1, n)))
+
+    return [n for n in range(limit + 1) if sieve[n]]
+
+
+@generator(13)
+def generate_day13(scale: int, rng: random.Random) -> str:
+    bus_count = 9 * scale
+    primes = [p for p in primes_up_to(max(1000, 40 * bus_count)) if p >= 13]
+    buses = rng.sample(primes, bus_count)
+
+    # Spread the buses out over the schedule, with gaps filled by 'x' (the
+    # first bus always leaves at offset 0)
+    schedule = [str(buses[0])]
+    for bus in buses[1:]:
+        schedule.extend(['x'] * rng.randint(0, 12))
+        schedule.append(str(bus))
+
+    return f'{rng.randint(10 ** 6, 10 ** 7)}\n' + ','.join(schedule)
+
+
+@generator(14)
+def generate_day14(scale: int, rng: random.Random) -> str:
+    lines = []
+    while len(lines) < 559 * scale:
+        floating_bits = set(rng.sample(range(36), rng.randint(0, 9)))
+        mask = ''.join('X' if i in floating_bits else rng.choice('01') for i in range(36))
+        lines.append(f'mask = {mask}')
+
+        for _ in range(rng.randint(1, 6)):
+            lines.append(f'mem[{rng.randint(0, 65535)}] = {rng.randint(1, 10 ** 9)}')
+
+    return '\n'.join(lines)
+
+
+@generator(15)
+def generate_day15(scale: int, rng: random.Random) -> str:
+    return ','.join(map(str, rng.sample(range(20 * scale), 7 * scale)))
+
+
+@generator(16)
+def generate_day16(scale: int, rng: random.Random) -> str:
+    # Every rule has a single hole in its range. Ranking the rules and putting
+    # the holes of every higher ranked rule into a field's column leaves that
+    # column with (rank + 1) candidate rules, which can be resolved one by one.
+    field_count = 20 * max(1, round(scale ** (1 / 3)))
+    ticket_count = 240 * scale
+    hole_width = max(1, min(10, 880 // field_count - 2))
+
+    # hole_starts[rank] is where the hole of the rule with that rank starts
+    hole_starts = rng.sample(range(60, 940 - hole_width, hole_width + 1), field_count)
+
+    names = [f'departure {w}' for w in unique_words(rng, 6)] + [f'field {w}' for w in unique_words(rng, field_count - 6)]
+    rules = []  # (name, lower_range, upper_range), in rank order
+    for name, hole_start in zip(names, hole_starts):
+        lower_range = rng.randint(25, 50), hole_start - 1
+        upper_range = hole_start + hole_width, rng.randint(950, 974)
+        rules.append((name, lower_range, upper_range))
+
+    # rule_by_column[c] is the rank of the rule that column c holds
+    rule_by_column = list(range(field_count))
+    rng.shuffle(rule_by_column)
+    all_holes = set(v for s in hole_starts for v in range(s, s + hole_width))
+    common_values = [v for v in range(50, 950) if v not in all_holes]
+
+    def random_valid_ticket():
+        return [rng.choice(common_values) for _ in range(field_count)]
+
+    valid_tickets = [random_valid_ticket() for _ in range(max(ticket_count * 3 // 4, field_count))]
+    for column, rank in enumerate(rule_by_column):
+        rows = rng.sample(range(len(valid_tickets)), rank)
+        for hole_rank, row in enumerate(rows):
+            valid_tickets[row][column] = hole_starts[hole_rank] + rng.randrange(hole_width)
+
+    invalid_tickets = []
+    for _ in range(ticket_count - len(valid_tickets)):
+        ticket = random_valid_ticket()
+        ticket[rng.randrange(field_count)] = rng.choice([rng.randint(0, 24), rng.randint(975, 999)])
+        invalid_tickets.append(ticket)
+
+    nearby_tickets = valid_tickets + invalid_tickets
+    rng.shuffle(nearby_tickets)
+
+    shuffled_rules = list(rules)
+    rng.shuffle(shuffled_rules)
+    lines = [f'{name}: {l[0]}-{l[1]} or {u[0]}-{u[1]}' for name, l, u in shuffled_rules]
+    lines.extend(['', 'your ticket:', ','.join(map(str, random_valid_ticket())), '', 'nearby tickets:'])
+    lines.extend(','.join(map(str, t)) for t in nearby_tickets)
+    return '\n'.join(lines)
+
+
+@generator(17)
+def generate_day17(scale: int, rng: random.Random) -> str:
+    side = scaled_side(8, scale)
+    return '\n'.join(''.join(rng.choice('#.') for _ in range(side)) for _ in range(side))
+
+
+@generator(18)
+def generate_day18(scale: int, rng: random.Random) -> str:
+    def expression(depth: int) -> str:
+        terms = []
+        for _ in range(rng.randint(2, 6)):
+            if depth < 3 and rng.random() < 0.25:
+                terms.append(f'({expression(depth + 1)})')
+            else:
+                terms.append(str(rng.randint(1, 9)))
+
+        tokens = [terms[0]]
+        for term in terms[1:]:
+            tokens.extend([rng.choice('+*'), term])
+        return ' '.join(tokens)
+
+    return '\n'.join(expression(0) for _ in range(375 * scale))
+
+
+@generator(19)
+def generate_day19(scale: int, rng: random.Random) -> str:
+    # Rules 42 and 31 match fixed length chunks (starting with 'a' and 'b'
+    # respectively, so they never overlap). Every other rule is 'a X | b Y'
+    # (or 'b X | a Y') over shorter rules, so each message has a single parse.
+    # Bigger scales use longer chunks (so more rules) and more messages.
+    chunk_length = 8 * 2 ** round(log10(scale))
+    rules: Dict[int, List[List[int]]] = {}
+    constants = {}
+
+    def new_rule_id() -> int:
+        rule_id = rng.randint(0, 4 * len(rules) + 200)
+        while rule_id in rules or rule_id in constants or rule_id in (0, 8, 11, 31, 42):
+            rule_id = rng.randint(0, 4 * len(rules) + 200)
+        return rule_id
+
+    a_rule = new_rule_id()
+    constants[a_rule] = 'a'
+    b_rule = new_rule_id()
+    constants[b_rule] = 'b'
+
+    # rules_by_length[n] holds a few rules that match strings of length n
+    rules_by_length = [[], [a_rule, b_rule]]
+    for length in range(2, chunk_length):
+        rules_by_length.append([])
+        for _ in range(3):
+            rule_id = new_rule_id()
+            first, second = rng.sample([a_rule, b_rule], 2)
+            rules[rule_id] = [
+                [first, rng.choice(rules_by_length[length - 1])],
+                [second, rng.choice(rules_by_length[length - 1])],
+            ]
+            rules_by_length[length].append(rule_id)
+
+    rules[42] = [[a_rule, rng.choice(rules_by_length[chunk_length - 1])]]
+    rules[31] = [[b_rule, rng.choice(rules_by_length[chunk_length - 1])]]
+    rules[0] = [[8, 11]]
+    rules[8] = [[42]]
+    rules[11] = [[42, 31]]
+
+    def sample(rule_id: int) -> str:
+        if rule_id in constants:
+            return constants[rule_id]
+        return ''.join(sample(r) for r in rng.choice(rules[rule_id]))
+
+    messages = []
+    for _ in range(470 * scale):
+        roll = rng.random()
+        if roll < 0.3:
+            chunks = [42, 42, 31]
+        elif roll < 0.6:
+            right_count = rng.randint(1, 4)
+            chunks = [42] * rng.randint(right_count + 1, right_count + 5) + [31] * right_count
+        else:
+            chunks = [rng.choice([42, 31]) for _ in range(rng.randint(3, 12))]
+
+        message = ''.join(sample(c) for c in chunks)
+        if rng.random() < 0.1:
+            # Corrupt a character, which usually makes the message unmatchable
+            idx = rng.randrange(len(message))
+            message = message[:idx] + rng.choice('ab') + message[idx + 1:]
+        messages.append(message)
+
+    lines = []
+    for rule_id, alternatives in rules.items():
+        lines.append(f'{rule_id}: ' + ' | '.join(' '.join(map(str, a)) for a in alternatives))
+    lines.extend(f'{rule_id}: "{c}"' for rule_id, c in constants.items())
+    rng.shuffle(lines)
+
+    return '\n'.join(lines) + '\n\n' + '\n'.join(messages)
+
+
+@generator(20)
+def generate_day20(scale: int, rng: random.Random) -> str:
+    # Builds an image containing sea monsters, cuts it into tiles whose
+    # borders only match their real neighbors, and shuffles/rotates/flips them.
+    # Bigger scales use more tiles and longer borders (to keep them unique).
+    side = scaled_side(12, scale)
+    edge_count = 2 * side * (side + 1)
+    tile_size = max(10, (3 * edge_count // 2).bit_length() + 1)
+    inner_size = tile_size - 2
+    image_size = side * inner_size
+
+    image = [['#' if rng.random() < 0.25 else '.' for _ in range(image_size)] for _ in range(image_size)]
+    monster = [
+        (x, y)
+        for y, row in enumerate(['                  # ', '#    ##    ##    ###', ' #  #  #  #  #  #   '])
+        for x, c in enumerate(row)
+        if c == '#'
+    ]
+    for _ in range(max(1, image_size ** 2 // 2000)):
+        mx, my = rng.randrange(image_size - 20), rng.randrange(image_size - 3)
+        for dx, dy in monster:
+            image[my + dy][mx + dx] = '#'
+
+    # Corner pixels are shared by the borders that meet there
+    corners = [[rng.choice('#.') for _ in range(side + 1)] for _ in range(side + 1)]
+    seen_borders = set()
+
+    def unique_border(start: str, end: str) -> str:
+        while True:
+            border = start + ''.join(rng.choices('#.', k=tile_size - 2)) + end
+            key = min(border, border[::-1])
+            if border != border[::-1] and key not in seen_borders:
+                seen_borders.add(key)
+                return border
+
+    horizontal = [[unique_border(corners[y][x], corners[y][x + 1]) for x in range(side)] for y in range(side + 1)]
+    vertical = [[unique_border(corners[y][x], corners[y + 1][x]) for x in range(side + 1)] for y in range(side)]
+
+    tile_ids = rng.sample(range(1000, 1000 + 10 * side * side), side * side)
+    tiles = []
+    for y in range(side):
+        for x in range(side):
+            data = [list(horizontal[y][x])]
+            for row in range(inner_size):
+                image_row = image[y * inner_size + row][x * inner_size:(x + 1) * inner_size]
+                data.append([vertical[y][x][row + 1]] + image_row + [vertical[y][x + 1][row + 1]])
+            data.append(list(horizontal[y + 1][x]))
+
+            for _ in range(rng.randrange(4)):
+                data = [list(r) for r in zip(*data[::-1])]
+            if rng.random() < 0.5:
+                data = [r[::-1] for r in data]
+
+            tiles.append(f'Tile {tile_ids[len(tiles)]}:\n' + '\n'.join(''.join(r) for r in data))
+
+    rng.shuffle(tiles)
+    return '\n\n'.join(tiles)
+
+
+@generator(21)
+def generate_day21(scale: int, rng: random.Random) -> str:
+    allergen_count = 8 * max(1, round(scale ** (1 / 3)))
+    allergens = unique_words(rng, allergen_count, 4, 9)
+    ingredients = unique_words(rng, 200 * max(1, round(scale ** 0.5)) + allergen_count, 3, 8)
+    dangerous = dict(zip(allergens, rng.sample(ingredients, allergen_count)))
+    safe_ingredients = [i for i in ingredients if i not in dangerous.values()]
+
+    foods = []
+
+    def add_food(listed_allergens: List[str], extra_dangerous: List[str]):
+        food_ingredients = set(rng.sample(safe_ingredients, rng.randint(20, 60)))
+        food_ingredients.update(dangerous[a] for a in listed_allergens)
+        food_ingredients.update(extra_dangerous)
+        foods.append((food_ingredients, listed_allergens))
+
+    for _ in range(41 * scale):
+        listed_allergens = rng.sample(allergens, rng.randint(1, 3))
+        unlisted = [dangerous[a] for a in rng.sample(allergens, 2) if a not in listed_allergens]
+        add_food(listed_allergens, unlisted)
+
+    # Every allergen gets a food that only lists it and has no other dangerous
+    # ingredient, and safe ingredients left in the intersection get ruled out.
+    for allergen in allergens:
+        add_food([allergen], [])
+        while True:
+            common = set.intersection(*[i for i, a in foods if allergen in a]) - {dangerous[allergen]}
+            if not common:
+                break
+            food_ingredients = set(rng.sample([i for i in safe_ingredients if i not in common], 20))
+            foods.append((food_ingredients | {dangerous[allergen]}, [allergen]))
+
+    rng.shuffle(foods)
+    return '\n'.join(
+        f'{" ".join(rng.sample(sorted(i), len(i)))} (contains {", ".join(a)})'
+        for i, a in foods
+    )
+
+
+@generator(22)
+def generate_day22(scale: int, rng: random.Random) -> str:
+    deck_size = 25 * scale
+
+    def terminates(p1_deck: List[int], p2_deck: List[int]) -> bool:
+        # Plain combat can loop forever for a few deals, so reject deals that
+        # haven't finished long after a typical game (~deck_size² rounds) would.
+        # Past 100x simulating that costs more than it's worth, so trust the deal.
+        if deck_size > 2500:
+            return True
+
+        p1_deck, p2_deck = deque(p1_deck), deque(p2_deck)
+        for _ in range(20 * deck_size ** 2):
+            if not p1_deck or not p2_deck:
+                return True
+            p1_top, p2_top = p1_deck.popleft(), p2_deck.popleft()
+            if p1_top > p2_top:
+                p1_deck.extend((p1_top, p2_top))
+            else:
+                p2_deck.extend((p2_top, p1_top))
+        return False
+
+    while True:
+        cards = list(range(1, 2 * deck_size + 1))
+        rng.shuffle(cards)
+        p1_deck, p2_deck = cards[:deck_size], cards[deck_size:]
+        if terminates(p1_deck, p2_deck):
+            break
+
+    return 'Player 1:\n' + '\n'.join(map(str, p1_deck)) + '\n\nPlayer 2:\n' + '\n'.join(map(str, p2_deck))
+
+
+@generator(23)
+def generate_day23(scale: int, rng: random.Random) -> str:
+    # The input format is one digit per cup, so it can only ever describe the
+    # cups 1-9; every scale gives a shuffled 1-9 (the work is fixed by part 2).
+    return ''.join(map(str, rng.sample(range(1, 10), 9)))
+
+
+@generator(24)
+def generate_day24(scale: int, rng: random.Random) -> str:
+    return '\n'.join(
+        ''.join(rng.choices(['e', 'se', 'sw', 'w', 'nw', 'ne'], k=rng.randint(10, 20)))
+        for _ in range(480 * scale)
+    )
+
+
+@generator(25)
+def generate_day25(scale: int, rng: random.Random) -> str:
+    # Bigger scales use bigger loop sizes (capped by the size of the group)
+    max_loop_size = min(20201226, 1000000 * scale)
+    card_loop_size, door_loop_size = (rng.randint(max_loop_size // 2, max_loop_size) for _ in range(2))
+    return f'{pow(7, card_loop_size, 20201227)}\n{pow(7, door_loop_size, 20201227)}'
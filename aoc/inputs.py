@@ -0,0 +1,129 @@
+import mmap
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+# Lines are split out of the mapped file a chunk at a time, so only about this
+# many bytes of line objects are alive at once, however big the file is
+CHUNK_SIZE = 1 << 20
+# Chunks handed to each worker by map_chunks; big enough that the cost of
+# starting a task is noise next to working through it
+PARALLEL_CHUNK_SIZE = 16 << 20
+
+
+def iter_mapped_spans(mapped: mmap.mmap, chunk_size: int = CHUNK_SIZE, separator: bytes = b'\n') -> Iterator[Tuple[int, int]]:
+    # Yields (start, end) byte offsets of chunks of roughly chunk_size bytes
+    # that always end on a separator (end points at the separator, if any).
+    # Splitting on b'\n\n' instead of b'\n' keeps blank line separated
+    # records whole.
+    size = len(mapped)
+    start = 0
+    while start < size:
+        end = mapped.find(separator, max(start, min(start + chunk_size, size) - len(separator)))
+        if end == -1:
+            end = size
+
+        yield start, end
+        start = end + len(separator)
+
+
+def iter_chunk_spans(path: str, chunk_size: int = CHUNK_SIZE, separator: bytes = b'\n') -> Iterator[Tuple[int, int]]:
+    with open(path, 'rb') as input_file:
+        if not os.fstat(input_file.fileno()).st_size:
+            return  # Empty files can't be mapped
+
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter_mapped_spans(mapped, chunk_size, separator)
+
+
+def clean_chunk(chunk: bytes) -> bytes:
+    return chunk.replace(b'\r', b'') if b'\r' in chunk else chunk
+
+
+def read_chunk(path: str, start: int, end: int) -> bytes:
+    # Reads a single span from iter_chunk_spans, e.g. in a worker process
+    with open(path, 'rb') as input_file:
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return clean_chunk(mapped[start:end])
+
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE, separator: bytes = b'\n') -> Iterator[bytes]:
+    # Yields the file in chunks of roughly chunk_size bytes that always end on
+    # a separator (the separator itself isn't included)
+    with open(path, 'rb') as input_file:
+        if not os.fstat(input_file.fileno()).st_size:
+            return
+
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start, end in iter_mapped_spans(mapped, chunk_size, separator):
+                yield clean_chunk(mapped[start:end])
+
+
+def map_span(path: str, func: Callable[[bytes], T], span: Tuple[int, int]) -> T:
+    return func(read_chunk(path, *span))
+
+
+def map_chunks(
+    path: str,
+    func: Callable[[bytes], T],
+    jobs: Optional[int] = 1,
+    separator: bytes = b'\n',
+    chunk_size: Optional[int] = None,
+) -> Iterator[T]:
+    # Yields func(chunk) for every chunk of the file (as split by iter_chunks),
+    # in file order. With jobs other than 1 the chunks are mapped by a process
+    # pool (jobs=None uses every core): workers are only sent a span and read
+    # their chunk from the file themselves, so func has to be picklable, e.g.
+    # a module level function or a partial of one.
+    if jobs == 1:
+        yield from map(func, iter_chunks(path, chunk_size or CHUNK_SIZE, separator))
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        spans = iter_chunk_spans(path, chunk_size or PARALLEL_CHUNK_SIZE, separator)
+        yield from executor.map(partial(map_span, path, func), spans)
+
+
+def iter_lines(path: str) -> Iterator[bytes]:
+    # Every line as bytes, without its line ending
+    for chunk in iter_chunks(path):
+        yield from chunk.split(b'\n')
+
+
+def iter_ints(path: str) -> Iterator[int]:
+    # Every whitespace separated integer in the file
+    for chunk in iter_chunks(path):
+        yield from map(int, chunk.split())
+
+
+def iter_records(path: str) -> Iterator[List[bytes]]:
+    # Groups of lines separated by blank lines (e.g. passports or survey groups)
+    record = []
+    for line in iter_lines(path):
+        if line:
+            record.append(line)
+        elif record:
+            yield record
+            record = []
+
+    if record:
+        yield record
+
+
+class InputInts:
+    """
+    Re-iterable view over the whitespace separated integers of an input file.
+    Every pass re-reads the mapped file, so nothing but the current chunk is
+    kept in memory between (or during) passes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[int]:
+        return iter_ints(self.path)
@@ -1,39 +1,71 @@
-from collections import defaultdict
-from typing import List
+import os
 
+from collections import Counter, deque
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from aoc.inputs import iter_ints
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+# How much higher an adapter's rating may be than the joltage plugged into it
+ADAPTER_GAPS = (1, 2, 3)
+# Built-in adapter is always 3 higher than the highest adapter
+DEVICE_GAP = 3
+
+
+def analyze_adapters(
+    adapter_joltages: Iterable[int],
+    gaps: Sequence[int] = ADAPTER_GAPS,
+    modulus: Optional[int] = None,
+) -> Tuple[Counter, int]:
+    # Walks the sorted joltages once, returning how often each difference
+    # shows up when every adapter is chained (device included), and how many
+    # arrangements reach the highest adapter (modulo modulus, if given).
+    # Only the joltages within the largest gap of the current one are kept,
+    # along with how many arrangements reach each of them, so memory doesn't
+    # depend on how big the joltages get.
+    allowed_gaps = frozenset(gaps)
+    max_gap = max(allowed_gaps)
+    differences = Counter()
+    recent = deque()  # (joltage, arrangements) pairs
+    previous_joltage = None
+    arrangements = 0
 
-def pt1_solution(adapter_joltages: List[int]) -> int:
-    differences = defaultdict(int)
-    current_joltage_rating = 0
     for joltage in adapter_joltages:
-        differences[joltage - current_joltage_rating] += 1
-        current_joltage_rating = joltage
+        if previous_joltage is None:
+            arrangements = 1  # The charging outlet
+        else:
+            differences[joltage - previous_joltage] += 1
+            while recent and joltage - recent[0][0] > max_gap:
+                recent.popleft()
+            arrangements = sum(count for prev_joltage, count in recent if joltage - prev_joltage in allowed_gaps)
+
+        if modulus is not None:
+            arrangements %= modulus
+        recent.append((joltage, arrangements))
+        previous_joltage = joltage
+
+    differences[DEVICE_GAP] += 1
+    return differences, arrangements
 
-    # Built-in adapter is always 3 higher than the highest adapter
-    differences[3] += 1
-    
+
+def parse_input(path: str = INPUT_PATH) -> List[int]:
+    # Add 0 as a joltage, for the charging outlet
+    return sorted([*iter_ints(path), 0])
+
+
+def pt1_solution(adapter_joltages: List[int]) -> int:
+    differences, _ = analyze_adapters(adapter_joltages)
     return differences[1] * differences[3]
 
 
 def pt2_solution(adapter_joltages: List[int]) -> int:
     # Assumes adapter_joltages is sorted in asc order
-    # Creates a list with a cell for each joltage from 0...max(joltage)+1+3,
-    # so we can safely get max(joltage) + 3 without indexing errors
-    dp_table = [0] * (adapter_joltages[-1] + 1 + 3)
-    
-    # Seed the initial value (max + 3)
-    dp_table[adapter_joltages[-1] + 3] = 1
-        
-    # Construct the table backwards
-    for joltage in reversed(adapter_joltages):
-        dp_table[joltage] = sum(dp_table[joltage + x] for x in (1, 2, 3))
-
-    return dp_table[adapter_joltages[0]]
+    return analyze_adapters(adapter_joltages)[1]
 
 
-with open('input') as input_file:
-    # Add 0 as a joltage, for the charging outlet
-    adapter_joltages = sorted([int(l.strip()) for l in input_file] + [0])
-
-print(f'Part 1: {pt1_solution(adapter_joltages)}')
-print(f'Part 2: {pt2_solution(adapter_joltages)}')
\ No newline at end of file
+if __name__ == "__main__":
+    differences, arrangements = analyze_adapters(parse_input())
+    print(f'Part 1: {differences[1] * differences[3]}')
+    print(f'Part 2: {arrangements}')
@@ -1,3 +1,6 @@
+import numpy as np
+import os
+
 from copy import deepcopy
 from enum import Enum
 from functools import cached_property
@@ -5,6 +8,8 @@ from itertools import product
 from typing import Callable, Iterable, List, Tuple
 
 
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
 OCCUPIED = '#'
 EMPTY = 'L'
 FLOOR = '.'
@@ -71,6 +76,184 @@ class GridProcessor:
             occupied_seat_count = new_occupied_seat_count
 
 
+class DenseGridProcessor:
+    """
+    Vectorized version of GridProcessor with the adjacency rules: seats and
+    occupants are kept as small-int NumPy arrays, and every generation
+    updates all cells at once with a handful of array operations.
+    """
+
+    def __init__(self, grid: Grid, max_offending_occupants: int):
+        layout = np.array(grid)
+        self.seats = layout != FLOOR
+        self.occupied = (layout == OCCUPIED).astype(np.uint8)
+        self.max_offending_occupants = max_offending_occupants
+
+    def count_occupied_seats(self) -> int:
+        return int(self.occupied.sum())
+
+    def count_adjacent_occupants(self) -> np.ndarray:
+        # Sums each 3x3 box of the zero-padded grid (a row of three, then three
+        # of those rows) and takes the cell itself back out
+        padded = np.pad(self.occupied, 1)
+        row_sums = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+        box_sums = row_sums[:-2] + row_sums[1:-1] + row_sums[2:]
+        return box_sums - self.occupied
+
+    def apply_rules(self) -> bool:
+        # Returns whether any seat changed
+        occupant_counts = self.count_adjacent_occupants()
+        stays_or_becomes_occupied = np.where(
+            self.occupied.astype(bool),
+            occupant_counts < self.max_offending_occupants,
+            occupant_counts == 0,
+        )
+        new_occupied = (self.seats & stays_or_becomes_occupied).astype(np.uint8)
+
+        changed = not np.array_equal(new_occupied, self.occupied)
+        self.occupied = new_occupied
+        return changed
+
+    def process_seats(self) -> int:
+        # Returns the number of seats that are occupied once the layout stops changing
+        while self.apply_rules():
+            pass
+
+        return self.count_occupied_seats()
+
+
+def shift(cells: np.ndarray, dx: int, dy: int, fill: int = -1) -> np.ndarray:
+    # shifted[y, x] = cells[y + dy, x + dx], or fill where that's off the grid
+    height, width = cells.shape
+    shifted = np.full_like(cells, fill)
+    shifted[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)] = \
+        cells[max(0, dy):height + min(0, dy), max(0, dx):width + min(0, dx)]
+    return shifted
+
+
+def get_first_seats(seat_ids: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    # For every cell, the id of the first seat found walking from it (itself
+    # included) in the (dx, dy) direction, or -1 if there's none. Sweeps from
+    # the far side one row (or column, for horizontal directions) at a time,
+    # so each line is one vectorized step.
+    height, width = seat_ids.shape
+    first_seats = np.full_like(seat_ids, -1)
+    if dy:
+        for y in (range(height - 1, -1, -1) if dy > 0 else range(height)):
+            beyond = first_seats[y + dy] if 0 <= y + dy < height else np.full(width, -1)
+            beyond = shift(beyond[np.newaxis], dx, 0)[0]
+            first_seats[y] = np.where(seat_ids[y] >= 0, seat_ids[y], beyond)
+    else:
+        for x in (range(width - 1, -1, -1) if dx > 0 else range(width)):
+            beyond = first_seats[:, x + dx] if 0 <= x + dx < width else np.full(height, -1)
+            first_seats[:, x] = np.where(seat_ids[:, x] >= 0, seat_ids[:, x], beyond)
+
+    return first_seats
+
+
+class VisibilityGraph:
+    """
+    Which seats every seat looks at, worked out once since the floor never
+    changes: either the adjacent seats, or (with raycast) the first seat in
+    each of the 8 directions. Stored CSR-style: seat i's neighbours are
+    neighbour_ids[offsets[i]:offsets[i + 1]]. Seeing is mutual in both modes
+    (whatever's in between is floor), so the same lists say who sees seat i.
+    """
+
+    def __init__(self, grid: Grid, raycast: bool = False):
+        layout = np.array(grid)
+        is_seat = layout != FLOOR
+        seat_ids = np.full(layout.shape, -1, dtype=np.int64)
+        seat_ids[is_seat] = np.arange(is_seat.sum())
+        self.initially_occupied = layout[is_seat] == OCCUPIED
+
+        neighbours = np.stack([
+            shift(get_first_seats(seat_ids, dx, dy) if raycast else seat_ids, dx, dy)[is_seat]
+            for dx, dy in ADJACENT_OFFSETS
+        ], axis=1)
+        has_neighbour = neighbours >= 0
+        self.offsets = np.concatenate(([0], np.cumsum(has_neighbour.sum(axis=1))))
+        self.neighbour_ids = neighbours[has_neighbour]
+
+    @property
+    def seat_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_neighbours(self, seat_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Returns the neighbours of all the given seats, concatenated, along
+        # with how many neighbours each of the seats has
+        starts = self.offsets[seat_ids]
+        lengths = self.offsets[seat_ids + 1] - starts
+        first_positions = np.cumsum(lengths) - lengths
+        edge_idxs = np.arange(lengths.sum()) + np.repeat(starts - first_positions, lengths)
+        return self.neighbour_ids[edge_idxs], lengths
+
+
+# Frontiers with more than 1/MASK_DEDUPE_RATIO as many entries as there are
+# seats are deduped with a mask instead of a sort
+MASK_DEDUPE_RATIO = 64
+
+
+class FrontierGridProcessor:
+    """
+    Steps the seat rules over a precomputed VisibilityGraph, only re-checking
+    seats that changed in the last generation or can see one that did. Each
+    seat's count of visible occupants is kept up to date as seats flip, so
+    the total work follows the number of changes rather than the size of
+    the grid times the number of generations.
+    """
+
+    def __init__(self, graph: VisibilityGraph, max_offending_occupants: int):
+        self.graph = graph
+        self.max_offending_occupants = max_offending_occupants
+        self.occupied = graph.initially_occupied.copy()
+
+        all_seats = np.arange(graph.seat_count)
+        neighbours, lengths = graph.get_neighbours(all_seats)
+        self.occupant_counts = np.bincount(
+            np.repeat(all_seats, lengths), weights=self.occupied[neighbours], minlength=graph.seat_count
+        ).astype(np.int64)
+        self.frontier = all_seats
+
+    def count_occupied_seats(self) -> int:
+        return int(self.occupied.sum())
+
+    def apply_rules(self) -> bool:
+        # Returns whether any seat changed
+        occupied = self.occupied[self.frontier]
+        occupant_counts = self.occupant_counts[self.frontier]
+        flips = np.where(occupied, occupant_counts >= self.max_offending_occupants, occupant_counts == 0)
+        flipped = self.frontier[flips]
+        if not flipped.size:
+            return False
+
+        # Flip them all together, then let everyone who sees them know
+        self.occupied[flipped] ^= True
+        neighbours, lengths = self.graph.get_neighbours(flipped)
+        np.add.at(self.occupant_counts, neighbours, np.repeat(np.where(self.occupied[flipped], 1, -1), lengths))
+
+        # Dedupe the next frontier: sorting costs time in proportion to the
+        # frontier, but while a big share of the grid is still changing it's
+        # far cheaper to flag seats in a grid-sized mask and read them back
+        frontier = np.concatenate((flipped, neighbours))
+        if len(frontier) * MASK_DEDUPE_RATIO < self.graph.seat_count:
+            frontier.sort()
+            self.frontier = frontier[np.concatenate(([True], frontier[1:] != frontier[:-1]))]
+        else:
+            in_frontier = np.zeros(self.graph.seat_count, dtype=bool)
+            in_frontier[frontier] = True
+            self.frontier = np.flatnonzero(in_frontier)
+
+        return True
+
+    def process_seats(self) -> int:
+        # Returns the number of seats that are occupied once the layout stops changing
+        while self.apply_rules():
+            pass
+
+        return self.count_occupied_seats()
+
+
 def get_adjacent_occupancies(grid: Grid, cx: int, cy: int) -> Tuple[int, int]:
     for dx, dy in ADJACENT_OFFSETS:
         x, y = cx + dx, cy + dy
@@ -92,10 +275,20 @@ def get_raycast_occupancies(grid: Grid, cx: int, cy: int) -> Tuple[int, int]:
             x, y = x + dx, y + dy
 
 
-with open('input') as input_file:
-    grid = Grid(list(l.strip()) for l in input_file.readlines())
+def parse_input(path: str = INPUT_PATH) -> Grid:
+    with open(path) as input_file:
+        return Grid(list(l.strip()) for l in input_file.readlines())
+
+
+def pt1_solution(grid: Grid) -> int:
+    return DenseGridProcessor(grid, 4).process_seats()
+
+
+def pt2_solution(grid: Grid) -> int:
+    return FrontierGridProcessor(VisibilityGraph(grid, raycast=True), 5).process_seats()
+
 
-pt1_processor = GridProcessor(grid, get_adjacent_occupancies, 4)
-pt2_processor = GridProcessor(grid, get_raycast_occupancies, 5)
-print(f'Part 1: {pt1_processor.process_seats()}')
-print(f'Part 2: {pt2_processor.process_seats()}')
+if __name__ == "__main__":
+    grid = parse_input()
+    print(f'Part 1: {pt1_solution(grid)}')
+    print(f'Part 2: {pt2_solution(grid)}')
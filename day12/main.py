@@ -1,62 +1,154 @@
-from enum import Enum
-from typing import List, Tuple
+import os
+
+from dataclasses import dataclass
+from functools import partial, reduce
+from typing import Dict, Optional, Tuple
+
+from aoc.inputs import map_chunks
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+# Points and vectors are Gaussian integers: (x, y) stands for x + yi, so
+# multiplying by i rotates 90 deg CCW, and everything stays an exact int
+Vector = Tuple[int, int]
+
+DIRECTIONS = {'N': (0, 1), 'S': (0, -1), 'E': (1, 0), 'W': (-1, 0)}
+# i^0, i^1, i^2, i^3
+ROTATIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+START_HEADING = (1, 0)  # Part 1: the ship starts facing east...
+START_WAYPOINT = (10, 1)  # Part 2: ...or with the waypoint 10 east and 1 north of it
+
+
+def add(a: Vector, b: Vector) -> Vector:
+    return a[0] + b[0], a[1] + b[1]
+
+
+def multiply(a: Vector, b: Vector) -> Vector:
+    return a[0] * b[0] - a[1] * b[1], a[0] * b[1] + a[1] * b[0]
+
+
+@dataclass(frozen=True)
+class Transform:
+    """
+    What a run of instructions does to the ship's position p and its vector v
+    (the heading in part 1, the waypoint in part 2), as an exact affine map:
+
+        v' = rotation * v + vector_offset
+        p' = p + ship_per_vector * v + ship_offset
+
+    Maps of this shape compose into another one, and composition is
+    associative, so a route can be reduced in any grouping of its chunks.
+    """
+
+    rotation: Vector = (1, 0)
+    ship_per_vector: Vector = (0, 0)
+    vector_offset: Vector = (0, 0)
+    ship_offset: Vector = (0, 0)
+
+    def then(self, other: 'Transform') -> 'Transform':
+        # This transform followed by the other one
+        return Transform(
+            rotation=multiply(other.rotation, self.rotation),
+            ship_per_vector=add(self.ship_per_vector, multiply(other.ship_per_vector, self.rotation)),
+            vector_offset=add(multiply(other.rotation, self.vector_offset), other.vector_offset),
+            ship_offset=add(
+                add(self.ship_offset, multiply(other.ship_per_vector, self.vector_offset)), other.ship_offset
+            ),
+        )
+
+    def apply(self, position: Vector, vector: Vector) -> Tuple[Vector, Vector]:
+        return (
+            add(add(position, multiply(self.ship_per_vector, vector)), self.ship_offset),
+            add(multiply(self.rotation, vector), self.vector_offset),
+        )
+
+
+IDENTITY = Transform()
+
+
+MOVE, ROTATE, FORWARD = range(3)
+
+
+def compile_instruction(action: str, value: int) -> Tuple[int, int, int]:
+    # Turns an instruction into a (kind, a, b) triple for reduce_chunk, which
+    # decides whether a MOVE applies to the ship (part 1) or the waypoint
+    # (part 2); everything else means the same thing for both.
+    if action in DIRECTIONS:
+        return MOVE, DIRECTIONS[action][0] * value, DIRECTIONS[action][1] * value
+    elif action == 'L':
+        return (ROTATE, *ROTATIONS[(value // 90) % 4])
+    elif action == 'R':
+        return (ROTATE, *ROTATIONS[-(value // 90) % 4])
+    elif action == 'F':
+        return FORWARD, value, 0
+
+    raise ValueError(f'Unknown action {action!r}')
+
+
+def reduce_chunk(chunk: bytes, moves_waypoint: bool) -> Transform:
+    # Composes the chunk's instructions into one transform. Every instruction
+    # only touches a couple of the transform's terms, so rather than building
+    # a Transform per instruction and composing the general way, the terms
+    # are kept in plain ints and each kind of instruction updates just its
+    # own. Routes repeat the same few lines over and over, so each distinct
+    # line is only compiled once.
+    compiled: Dict[bytes, Tuple[int, int, int]] = {}
+    rx, ry, mx, my, vx, vy, sx, sy = 1, 0, 0, 0, 0, 0, 0, 0
+    for line in chunk.split():
+        instruction = compiled.get(line)
+        if instruction is None:
+            instruction = compiled[line] = compile_instruction(chr(line[0]), int(line[1:]))
+
+        kind, a, b = instruction
+        if kind == MOVE:
+            if moves_waypoint:
+                vx, vy = vx + a, vy + b
+            else:
+                sx, sy = sx + a, sy + b
+        elif kind == ROTATE:
+            rx, ry = a * rx - b * ry, a * ry + b * rx
+            vx, vy = a * vx - b * vy, a * vy + b * vx
+        else:
+            mx, my = mx + a * rx, my + a * ry
+            sx, sy = sx + a * vx, sy + a * vy
+
+    return Transform(rotation=(rx, ry), ship_per_vector=(mx, my), vector_offset=(vx, vy), ship_offset=(sx, sy))
+
+
+def reduce_route(path: str, moves_waypoint: bool, jobs: Optional[int] = 1) -> Transform:
+    # Composes the whole route into one transform. Chunks are reduced on
+    # their own (in parallel, with jobs other than 1) and the results are
+    # composed in order.
+    chunk_transforms = map_chunks(path, partial(reduce_chunk, moves_waypoint=moves_waypoint), jobs)
+    return reduce(Transform.then, chunk_transforms, IDENTITY)
 
 
 def manhattan_distance(x1: int, y1: int, x2: int, y2: int) -> int:
-    return int(abs(x2 - x1) + abs(y2 - y1))
-
-
-def process_instructions_pt1(instructions: List[Tuple[str, int]]) -> Tuple[int, int]:
-    angle = 1 + 0j
-    position = 0 + 0j
-
-    for action, value in instructions:
-        if action == 'N':
-            position += 1j * value
-        elif action == 'S':
-            position -= 1j * value
-        elif action == 'E':
-            position += value
-        elif action == 'W':
-            position -= value
-        elif action == 'L':
-            angle *= 1j ** (value // 90)  # Multiplying by i^n -> rotates 90*n deg CCW
-        elif action == 'R':
-            angle /= 1j ** (value // 90)  # Dividing by i^n -> rotates 90*n deg CW
-        elif action == 'F':
-            position += angle * value
-
-    return position.real, position.imag
-
-
-def process_instructions_pt2(instructions: List[Tuple[str, int]]) -> Tuple[int, int]:
-    position = 0 + 0j
-    waypoint = 10 + 1j  # Relative to ship
-
-    for action, value in instructions:
-        if action == 'N':
-            waypoint += 1j * value
-        elif action == 'S':
-            waypoint -= 1j * value
-        elif action == 'E':
-            waypoint += value
-        elif action == 'W':
-            waypoint -= value
-        elif action == 'L':
-            waypoint *= 1j ** (value // 90)  # Multiplying by i^n -> rotates 90*n deg CCW
-        elif action == 'R':
-            waypoint /= 1j ** (value // 90)  # Dividing by i^n -> rotates 90*n deg CW
-        elif action == 'F':
-            position += waypoint * value
-
-    return position.real, position.imag
-
-
-with open('input') as input_file:
-    instructions = [(i[0], int(i[1:])) for i in (l.strip() for l in input_file)]
-
-pt1_position = process_instructions_pt1(instructions)
-print(f'Part 1: {manhattan_distance(0, 0, *pt1_position)}')
-
-pt2_position = process_instructions_pt2(instructions)
-print(f'Part 2: {manhattan_distance(0, 0, *pt2_position)}')
+    return abs(x2 - x1) + abs(y2 - y1)
+
+
+def navigate(path: str, moves_waypoint: bool, start_vector: Vector, jobs: Optional[int] = 1) -> int:
+    # Returns how far from the start the ship ends up
+    position, _ = reduce_route(path, moves_waypoint, jobs).apply((0, 0), start_vector)
+    return manhattan_distance(0, 0, *position)
+
+
+def parse_input(path: str = INPUT_PATH) -> str:
+    # Instructions are compiled a chunk at a time while the route is reduced
+    return path
+
+
+def pt1_solution(path: str) -> int:
+    return navigate(path, False, START_HEADING)
+
+
+def pt2_solution(path: str) -> int:
+    return navigate(path, True, START_WAYPOINT)
+
+
+if __name__ == "__main__":
+    path = parse_input()
+    print(f'Part 1: {pt1_solution(path)}')
+    print(f'Part 2: {pt2_solution(path)}')
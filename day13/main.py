@@ -1,37 +1,95 @@
-import itertools
-import math
-
-from typing import List, Tuple
-
-        
-def get_solution(values: List[Tuple[int, int]], search_from: int) -> int:
-    # Returns the first solution that solves the problem for the given
-    # set of [(phase, minute), ...]
-    
-    search_step = math.lcm(*[m for _, m in values[:-1]])
-    for n in itertools.count(search_from, search_step):
-        for phase, minute in values:
-            if (n + phase) % minute != 0:
-                break  # This multiple doesn't satisfy at least one of the phase/minute combos
-        else:  # Got through all the values! Found our solution.
-            return n
-
-
-with open('input') as input_file:
-    departure_time = int(input_file.readline().strip())
-    values = [s for s in input_file.readline().strip().split(',')]
-    values = [(idx, int(i)) for idx, i in enumerate(values) if i != 'x']
-    
-earliest_bus = (None, 1000000000000)
-for _, minute in values:
-    nearest_departure = math.ceil(departure_time / minute) * minute
-    if nearest_departure < earliest_bus[1]:
-        earliest_bus = minute, nearest_departure
-
-print(f'Part 1: {earliest_bus[0] * (earliest_bus[1] - departure_time)}')
-
-search_from = 0
-for i in range(2, len(values) + 1):
-    search_from = get_solution(values[:i], search_from)
-
-print(f'Part 2: {search_from}')
\ No newline at end of file
+import os
+
+from typing import Iterable, List, Optional, Tuple
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+
+def ceil_div(a: int, b: int) -> int:
+    # Exact ceiling division, no float rounding for huge timestamps
+    return -(-a // b)
+
+
+def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    # Returns (g, x, y) with a * x + b * y == g == gcd(a, b)
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r:
+        quotient = old_r // r
+        old_r, r = r, old_r - quotient * r
+        old_x, x = x, old_x - quotient * x
+        old_y, y = y, old_y - quotient * y
+
+    return old_r, old_x, old_y
+
+
+def combine_congruences(
+    remainder1: int, modulus1: int, remainder2: int, modulus2: int
+) -> Optional[Tuple[int, int]]:
+    # Merges x = remainder1 (mod modulus1) and x = remainder2 (mod modulus2)
+    # into a single x = remainder (mod lcm), or None if nothing satisfies
+    # both. The moduli don't have to be coprime.
+    g, inverse, _ = extended_gcd(modulus1, modulus2)
+    difference = remainder2 - remainder1
+    if difference % g:
+        return None
+
+    # modulus1 * k = difference (mod modulus2), and inverse inverts
+    # modulus1 / g modulo modulus2 / g
+    reduced_modulus2 = modulus2 // g
+    k = (difference // g) * inverse % reduced_modulus2
+    lcm = modulus1 * reduced_modulus2
+    return (remainder1 + modulus1 * k) % lcm, lcm
+
+
+def solve_congruences(congruences: Iterable[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    # Folds [(remainder, modulus), ...] into one (remainder, modulus), or None
+    # if the system has no solution
+    remainder, modulus = 0, 1
+    for next_remainder, next_modulus in congruences:
+        combined = combine_congruences(remainder, modulus, next_remainder % next_modulus, next_modulus)
+        if combined is None:
+            return None
+        remainder, modulus = combined
+
+    return remainder, modulus
+
+
+def get_solution(values: List[Tuple[int, int]]) -> int:
+    # Returns the first timestamp that solves the problem for the given
+    # set of [(phase, minute), ...]: bus `minute` leaves `phase` minutes
+    # after it, i.e. the timestamp is -phase modulo minute
+    solution = solve_congruences((-phase, minute) for phase, minute in values)
+    if solution is None:
+        raise ValueError('No timestamp lines up with every bus')
+
+    return solution[0]
+
+
+def parse_input(path: str = INPUT_PATH) -> Tuple[int, List[Tuple[int, int]]]:
+    with open(path) as input_file:
+        departure_time = int(input_file.readline().strip())
+        values = [s for s in input_file.readline().strip().split(',')]
+        values = [(idx, int(i)) for idx, i in enumerate(values) if i != 'x']
+
+    return departure_time, values
+
+
+def pt1_solution(schedule: Tuple[int, List[Tuple[int, int]]]) -> int:
+    departure_time, values = schedule
+
+    nearest_departure, minute = min((ceil_div(departure_time, minute) * minute, minute) for _, minute in values)
+    return minute * (nearest_departure - departure_time)
+
+
+def pt2_solution(schedule: Tuple[int, List[Tuple[int, int]]]) -> int:
+    _, values = schedule
+    return get_solution(values)
+
+
+if __name__ == "__main__":
+    schedule = parse_input()
+    print(f'Part 1: {pt1_solution(schedule)}')
+    print(f'Part 2: {pt2_solution(schedule)}')
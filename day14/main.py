@@ -1,86 +1,158 @@
+import numpy as np
+import os
 import re
 
-from functools import partial
-from itertools import chain, combinations
-from typing import List, Tuple
-
-
-# From official Python itertools powerset recipe
-def powerset(iterable):
-    "powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"
-    s = list(iterable)
-    return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
-
-
-def apply_mask_to_int(mask: str, n: int) -> str:
-    result = list(f'{n:036b}')
-
-    for idx, char in enumerate(mask):
-        if char != '0':
-            result[idx] = char
-
-    return ''.join(result)
-
-
-def pt1_solution(instructions: List[Tuple[str, str]]) -> int:
-    mask = {}
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple, Union
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+MEM_REGEX = re.compile(r'mem\[(\d+)\] = (\d+)')
+FLOATING_BITS_TABLE = str.maketrans('X01', '100')
+
+# A ternary address pattern: (fixed bits, floating bits), where the fixed
+# bits are 0 wherever the pattern floats
+Pattern = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Mask:
+    ones: int  # Bits the mask forces to 1
+    floating: int  # The mask's X bits
+
+    @classmethod
+    def from_string(cls, mask: str) -> 'Mask':
+        return cls(ones=int(mask.replace('X', '0'), 2), floating=int(mask.translate(FLOATING_BITS_TABLE), 2))
+
+    def apply_to_value(self, value: int) -> int:
+        # Part 1: X bits keep the value's bit, everything else is overwritten
+        return (value & self.floating) | self.ones
+
+    def apply_to_address(self, address: int) -> Pattern:
+        # Part 2: 1 bits are set, X bits float, 0 bits keep the address's bit
+        return (address | self.ones) & ~self.floating, self.floating
+
+
+Instruction = Union[Mask, Tuple[int, int]]
+
+
+def subtract_pattern(pattern: Pattern, other: Pattern) -> Iterator[Pattern]:
+    # Yields disjoint patterns covering the addresses of pattern that aren't
+    # in other (which must overlap it). For every bit where pattern floats but
+    # other is fixed, peel off the half of what's left that disagrees with
+    # other on that bit; what remains after that lies entirely inside other.
+    fixed, floating = pattern
+    other_fixed, other_floating = other
+    split_bits = floating & ~other_floating
+    while split_bits:
+        bit = split_bits & -split_bits
+        split_bits ^= bit
+        floating ^= bit
+        yield fixed | ((other_fixed & bit) ^ bit), floating
+        fixed |= other_fixed & bit
+
+
+class FloatingMemory:
+    """
+    Part 2's memory, without ever expanding floating addresses: it's a set of
+    disjoint ternary patterns, each holding one value. A write first carves
+    its pattern out of every pattern it overlaps, then adds its own. The
+    overlap check runs over NumPy arrays of the patterns, since it's the only
+    part that has to look at every stored pattern.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.fixed = np.zeros(capacity, dtype=np.int64)
+        self.floating = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.values: List[int] = []
+        self.dead_count = 0
+
+    def add(self, pattern: Pattern, value: int):
+        idx = len(self.values)
+        if idx == len(self.fixed):
+            self.fixed, self.floating, self.alive = (np.resize(a, 2 * idx) for a in (self.fixed, self.floating, self.alive))
+
+        self.fixed[idx], self.floating[idx] = pattern
+        self.alive[idx] = True
+        self.values.append(value)
+
+    def compact(self):
+        keep = np.flatnonzero(self.alive[:len(self.values)])
+        count = len(keep)
+        self.fixed[:count], self.floating[:count] = self.fixed[keep], self.floating[keep]
+        self.alive[:count], self.alive[count:] = True, False
+        self.values = [self.values[idx] for idx in keep]
+        self.dead_count = 0
+
+    def write(self, pattern: Pattern, value: int):
+        count = len(self.values)
+        fixed, floating = pattern
+        # Two patterns overlap iff they agree on every bit neither one floats
+        overlaps = self.alive[:count] & (((self.fixed[:count] ^ fixed) & ~(self.floating[:count] | floating)) == 0)
+
+        for idx in np.flatnonzero(overlaps):
+            self.alive[idx] = False
+            self.dead_count += 1
+            for piece in subtract_pattern((int(self.fixed[idx]), int(self.floating[idx])), pattern):
+                self.add(piece, self.values[idx])
+
+        self.add(pattern, value)
+        if self.dead_count > len(self.values) // 2:
+            self.compact()
+
+    def sum_values(self) -> int:
+        # Each pattern holds its value at 2^(floating bits) addresses
+        return sum(
+            value << bin(int(floating)).count('1')
+            for value, floating, alive in zip(self.values, self.floating, self.alive)
+            if alive
+        )
+
+
+def pt1_solution(instructions: List[Instruction]) -> int:
+    mask = Mask(ones=0, floating=-1)
     memory = {}
 
-    for lhs, rhs in instructions:
-        if lhs == 'mask':
-            # Clear the previous mask, and update
-            mask = {}
-            for idx, char in filter(lambda t: t[1] != 'X', enumerate(rhs)):
-                char = int(char)
-                mask[35 - idx] = char
+    for instruction in instructions:
+        if isinstance(instruction, Mask):
+            mask = instruction
         else:
-            # mem command
-            match = re.search(r'\[(\d+)\]', lhs)
-            address = int(match.group(1))
-            value = int(rhs)
-
-            # apply mask before setting value
-            for offset, mask_value in mask.items():
-                if mask_value == 0:
-                    value &= ~(1 << offset)  # Clear the offset'th bit
-                elif mask_value == 1:
-                    value |= (1 << offset)  # Set the offset'th bit n
-
-            memory[address] = value
+            address, value = instruction
+            memory[address] = mask.apply_to_value(value)
 
     return sum(memory.values())
 
 
-def pt2_solution(instructions: List[Tuple[str, str]]) -> int:
-    mask: str
-    memory = {}
+def pt2_solution(instructions: List[Instruction]) -> int:
+    mask = Mask(ones=0, floating=0)
+    memory = FloatingMemory()
 
-    for lhs, rhs in instructions:
-        if lhs == 'mask':
-            mask = rhs
+    for instruction in instructions:
+        if isinstance(instruction, Mask):
+            mask = instruction
         else:
-            match = re.search(r'\[(\d+)\]', lhs)
-            address = int(match.group(1))
+            address, value = instruction
+            memory.write(mask.apply_to_address(address), value)
 
-            masked_value = apply_mask_to_int(mask, address)
+    return memory.sum_values()
 
-            # Zero-out the X bits (this will be our initial number)
-            zerod_value = int(masked_value.replace('X', '0'), 2)
 
-            # Get all the different combos of bits for masked X values
-            combos = powerset(i for i, char in enumerate(reversed(mask)) if char == 'X')
+def parse_instruction(line: str) -> Instruction:
+    if line.startswith('mask'):
+        return Mask.from_string(line.split(' = ')[1])
 
-            # Now we can just add each of these values to the base
-            # and we have our addresses -- set em
-            for offset in map(lambda c: sum(map(partial(pow, 2), c)), combos):
-                memory[zerod_value + offset] = int(rhs)
+    address, value = MEM_REGEX.match(line).groups()
+    return int(address), int(value)
 
-    return sum(memory.values())
 
+def parse_input(path: str = INPUT_PATH) -> List[Instruction]:
+    with open(path) as file_input:
+        return [parse_instruction(l.strip()) for l in file_input if l.strip()]
 
-with open('input') as file_input:
-    instrs = [l.strip().split(' = ') for l in file_input]
-    instrs = [(lhs, rhs) for lhs, rhs in instrs]
 
-print(f'Part 1: {pt1_solution(instrs)}')
-print(f'Part 2: {pt2_solution(instrs)}')
+if __name__ == "__main__":
+    instrs = parse_input()
+    print(f'Part 1: {pt1_solution(instrs)}')
+    print(f'Part 2: {pt2_solution(instrs)}')
@@ -0,0 +1,36 @@
+import argparse
+import os
+import time
+
+from aoc.runner import get_peak_rss_kb
+from day15.main import CHECKPOINT_HEADER, DEFAULT_CHECKPOINT_TURNS, INPUT_PATH, parse_input, play_game
+
+
+def main():
+    # Plays the memory game to any turn and reports how fast it went and how
+    # much memory it took, e.g. to size a run before starting it:
+    #   python -m day15.bench --turns 300000000 --checkpoint day15.checkpoint
+    parser = argparse.ArgumentParser(description='Play the day 15 memory game to an arbitrary turn')
+    parser.add_argument('--turns', type=int, default=30_000_000)
+    parser.add_argument('--input', default=INPUT_PATH)
+    parser.add_argument('--checkpoint', help='file to save progress to and resume from')
+    parser.add_argument('--checkpoint-turns', type=int, default=DEFAULT_CHECKPOINT_TURNS)
+    args = parser.parse_args()
+
+    # Only the turns played by this run count towards the rate
+    start_turn = 0
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        with open(args.checkpoint, 'rb') as checkpoint_file:
+            start_turn = CHECKPOINT_HEADER.unpack(checkpoint_file.read(CHECKPOINT_HEADER.size))[0]
+
+    start = time.perf_counter()
+    answer = play_game(parse_input(args.input), args.turns, args.checkpoint, args.checkpoint_turns)
+    wall_time = time.perf_counter() - start
+
+    print(f'Turn {args.turns}: {answer}')
+    print(f'{wall_time:.3f}s ({(args.turns - start_turn) / wall_time / 1e6:.2f}M turns/s), '
+          f'{get_peak_rss_kb() / 1024:.1f} MiB peak RSS')
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,122 @@
-from collections import defaultdict, deque
-from itertools import chain, count
+import os
+import struct
 
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional
 
-with open('input') as input_file:
-    nums = list(map(int, input_file.readline().split(',')))
 
-latest_num = -1
-memory_idxs = defaultdict(lambda: deque([], maxlen=2))
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
+# With a checkpoint path, the game's state is saved every this many turns
+DEFAULT_CHECKPOINT_TURNS = 10_000_000
+# Checkpoint header: turn, last spoken number, table size, starting number count
+CHECKPOINT_HEADER = struct.Struct('<QQQQ')
 
-def speak(num: int, idx: int):
-    memory_idxs[num].append(idx)
-    global latest_num
-    latest_num = num
 
-# Set up initial memory
-for idx, num in enumerate(nums, 1):
-    speak(num, idx)
+@dataclass
+class GameState:
+    turn: int  # The turn `spoken` was spoken on
+    spoken: int
+    # The last turn each number was spoken on, before the current one (0 if
+    # never). A number spoken on turn t is at most t - 1, so a table as big as
+    # the final turn never needs to grow.
+    last_seen: array
+    starting_nums: List[int]
 
-for idx in count(len(nums) + 1):
-    if len(memory_idxs[latest_num]) == 1:  # First time a number has been spoken
-        number_to_speak = 0
+
+def new_game(nums: List[int], final_turn: int) -> GameState:
+    last_seen = array('I', bytes(4 * max(final_turn, max(nums) + 1)))
+    for turn, num in enumerate(nums[:-1], 1):
+        last_seen[num] = turn
+
+    return GameState(turn=len(nums), spoken=nums[-1], last_seen=last_seen, starting_nums=list(nums))
+
+
+def save_checkpoint(path: str, state: GameState):
+    # Written next to the real file and swapped in, so a run killed halfway
+    # through saving still leaves the previous checkpoint intact
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as checkpoint_file:
+        checkpoint_file.write(CHECKPOINT_HEADER.pack(state.turn, state.spoken, len(state.last_seen), len(state.starting_nums)))
+        array('Q', state.starting_nums).tofile(checkpoint_file)
+        state.last_seen.tofile(checkpoint_file)
+
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path: str, nums: List[int], final_turn: int) -> GameState:
+    with open(path, 'rb') as checkpoint_file:
+        turn, spoken, table_size, num_count = CHECKPOINT_HEADER.unpack(checkpoint_file.read(CHECKPOINT_HEADER.size))
+        starting_nums = array('Q')
+        starting_nums.fromfile(checkpoint_file, num_count)
+        last_seen = array('I')
+        last_seen.fromfile(checkpoint_file, table_size)
+
+    if list(starting_nums) != list(nums):
+        raise ValueError(f'Checkpoint {path} is for a game starting with {list(starting_nums)}, not {nums}')
+    if turn > final_turn:
+        raise ValueError(f'Checkpoint {path} is already past turn {final_turn}')
+
+    # The checkpoint may come from a run aiming for an earlier final turn
+    if len(last_seen) < final_turn:
+        last_seen.extend(array('I', bytes(4 * (final_turn - len(last_seen)))))
+
+    return GameState(turn=turn, spoken=spoken, last_seen=last_seen, starting_nums=list(nums))
+
+
+def play_turns(last_seen: array, turn: int, final_turn: int, spoken: int) -> int:
+    # `spoken` was spoken on `turn`; plays up to final_turn and returns the
+    # number spoken then. Nothing is allocated per turn.
+    for turn in range(turn, final_turn):
+        previous_turn = last_seen[spoken]
+        last_seen[spoken] = turn
+        spoken = turn - previous_turn if previous_turn else 0
+
+    return spoken
+
+
+def play_game(
+    nums: List[int],
+    final_turn: int,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_turns: int = DEFAULT_CHECKPOINT_TURNS,
+) -> int:
+    # Returns the number spoken on the final turn. With a checkpoint path the
+    # state is saved there every checkpoint_turns turns, and a game that finds
+    # a checkpoint already there picks up from it.
+    if final_turn <= len(nums):
+        return nums[final_turn - 1]
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path, nums, final_turn)
     else:
-        # Get the difference in the last two times we've seen the last number
-        number_to_speak = memory_idxs[latest_num][1] - memory_idxs[latest_num][0]
+        state = new_game(nums, final_turn)
+
+    while state.turn < final_turn:
+        segment_end = min(final_turn, state.turn + checkpoint_turns) if checkpoint_path else final_turn
+        state.spoken = play_turns(state.last_seen, state.turn, segment_end, state.spoken)
+        state.turn = segment_end
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state)
+
+    return state.spoken
+
+
+def parse_input(path: str = INPUT_PATH) -> List[int]:
+    with open(path) as input_file:
+        return list(map(int, input_file.readline().split(',')))
+
+
+def pt1_solution(nums: List[int]) -> int:
+    return play_game(nums, 2020)
+
+
+def pt2_solution(nums: List[int]) -> int:
+    return play_game(nums, 30000000)
 
-    speak(number_to_speak, idx)
 
-    if idx == 2020:
-        print(f'Part 1: {number_to_speak}')
-    elif idx == 30000000:
-        print(f'Part 2: {number_to_speak}')
-        break
+if __name__ == "__main__":
+    nums = parse_input()
+    print(f'Part 1: {pt1_solution(nums)}')
+    print(f'Part 2: {pt2_solution(nums)}')
@@ -1,9 +1,14 @@
+import numpy as np
+import os
 import re
 
+from collections import deque
 from dataclasses import dataclass
-from itertools import chain, product
 from math import prod
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
 
 @dataclass
@@ -19,98 +24,210 @@ class Rule:
 
 rules_regex = re.compile(r'([\w ]+): (\d+)-(\d+) or (\d+)-(\d+)')
 
-rules = []
-my_ticket: List[int]
-nearby_tickets: List[List[int]]
-with open('input') as file_input:
-    lines = [l.strip() for l in file_input.readlines()]
-
-i = 0
-while i < len(lines):
-    line = lines[i]
-
-    if match := rules_regex.match(line):
-        field_name = match.group(1)
-        lower_range = int(match.group(2)), int(match.group(3))
-        upper_range = int(match.group(4)), int(match.group(5))
-        rules.append(Rule(field_name, lower_range, upper_range))
-    elif line == 'your ticket:':
-        my_ticket = list(map(int, lines[i + 1].split(',')))
-        i += 1  # Skip extra line
-    elif line == 'nearby tickets:':
-        nearby_tickets = (list(map(int, l.split(','))) for l in lines[i + 1:])
-        break  # Done processing input
-
-    i += 1
-
-invalid_tickets = []
-valid_tickets = []
-invalid_value_sum = 0
-
-for ticket in nearby_tickets:
-    is_valid_ticket = True
-    for value in ticket:
-        if all(not rule.validate_value(value) for rule in rules):
-            invalid_value_sum += value
-            is_valid_ticket = False
-
-    if is_valid_ticket:
-        valid_tickets.append(ticket)
-    else:
-        invalid_tickets.append(ticket)
-
-print(f'Part 1: {invalid_value_sum}')
-
-# Form the initial 'simplified' list of possible indices
-# e.g. for the sample given on the site, it'll look like:
-# [[[1, 2],    [0, 1, 2], [0, 1, 2]],
-#  [[0, 1],    [0, 1, 2], [0, 1, 2]],
-#  [[0, 1, 2], [0, 1],    [0, 1, 2]]]
-# You then go column by column, "reducing" the possible values as much as you
-# can (by only keeping the common indices)
-# e.g. from the above example, we end up with:
-# [[1], [0, 1], [0, 1, 2]]
-# Now reduce it as much we can, each step looking for lists with 1 element and
-# removing them from the rest of the lists and updating our final index list.
-# We'll need to do this multiple times, until we're out of elements.
-# [[1], [0, 1], [0, 1, 2]]
-#   Found a [1] at index 0, so reduce and update our master list [1, -1, -1]
-# [[], [0], [0, 2]]
-#   Found a [0] at index 1, so reduce and update our master list [1, 0, -1]
-# [[], [], [2]]
-#   Found a [2] at index 2, so reduce and update our master list [1, 0, 2]
-# Now the rest of the problem is just looking up mapped indices.
-   
-valid_indexes = [[[i for i, r in enumerate(rules) if r.validate_value(v)] for v in vt] for vt in valid_tickets]
-interim_indices = [0] * len(rules)  # Dummy initial value, will be a list of sets of size len(rules)
-final_indices = [-1] * len(rules)  # Final list of ints indicating indices
-
-for column in range(len(rules)):
-    column_idxs = set(range(len(rules)))  # Default to all the rules
-    for row in valid_indexes:
-        column_idxs.intersection_update(row[column])
-        if len(column_idxs) == 1:  # Done with this column
-            break
-    interim_indices[column] = column_idxs
-
-print(interim_indices)
-while final_indices.count(-1):
-    # Collect all single elements and cull them from the rest of the set
-    single_elements = set()
-    for i, idxs in enumerate(interim_indices):
-        if len(idxs) == 1:
-            final_index = min(idxs)
-            single_elements.add(final_index)
-            final_indices[i] = final_index
-    
-    for idxs in interim_indices:
-        idxs.difference_update(single_elements)
-
-# Get fields that start with departure and their mapped values
-departure_idxs = set(idx for idx, r in enumerate(rules) if r.rule_name.startswith('departure'))
-departure_values = []
-for i, mapped_idx in enumerate(final_indices):
-    if mapped_idx in departure_idxs:
-        departure_values.append(my_ticket[i])
-
-print(f'Part 2: {prod(departure_values)}')
\ No newline at end of file
+
+def parse_input(path: str = INPUT_PATH) -> Tuple[List[Rule], List[int], np.ndarray]:
+    rules = []
+    my_ticket: List[int]
+    nearby_tickets: np.ndarray
+    with open(path) as file_input:
+        lines = [l.strip() for l in file_input.readlines()]
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        if match := rules_regex.match(line):
+            field_name = match.group(1)
+            lower_range = int(match.group(2)), int(match.group(3))
+            upper_range = int(match.group(4)), int(match.group(5))
+            rules.append(Rule(field_name, lower_range, upper_range))
+        elif line == 'your ticket:':
+            my_ticket = list(map(int, lines[i + 1].split(',')))
+            i += 1  # Skip extra line
+        elif line == 'nearby tickets:':
+            # One row per ticket, parsed in a single pass
+            ticket_lines = [l for l in lines[i + 1:] if l]
+            values = np.fromstring(','.join(ticket_lines), dtype=np.int64, sep=',')
+            nearby_tickets = values.reshape(len(ticket_lines), -1)
+            break  # Done processing input
+
+        i += 1
+
+    return rules, my_ticket, nearby_tickets
+
+
+# How many tickets are looked up at once; bounds the size of the per-value
+# rule mask arrays when scanning huge batches
+SCAN_BATCH_SIZE = 1 << 16
+
+
+def build_rule_table(rules: List[Rule]) -> np.ndarray:
+    # table[value] holds the bitmask of rules the value satisfies, split into
+    # 64 bit words (rule i is bit i % 64 of word i // 64), for every value up
+    # to the highest one any rule accepts
+    max_value = max(max(r.lower_range[1], r.upper_range[1]) for r in rules)
+    table = np.zeros((max_value + 1, (len(rules) + 63) // 64), dtype=np.uint64)
+    for rule_idx, rule in enumerate(rules):
+        word, bit = divmod(rule_idx, 64)
+        for low, high in (rule.lower_range, rule.upper_range):
+            table[low:high + 1, word] |= np.uint64(1 << bit)
+
+    return table
+
+
+def words_to_mask(words: np.ndarray) -> int:
+    return sum(int(word) << (64 * i) for i, word in enumerate(words))
+
+
+@dataclass
+class TicketScan:
+    error_rate: int  # The sum of every value no rule accepts
+    valid: np.ndarray  # Which tickets only hold values some rule accepts
+    # For every column, the bitmask of rules every valid ticket's value in it
+    # satisfies, ready for resolve_fields
+    column_candidates: List[int]
+
+
+def scan_tickets(rules: List[Rule], nearby_tickets: np.ndarray) -> TicketScan:
+    # Looks up every value's rule mask in a table built once, then works out
+    # the error rate, the valid tickets and each column's candidate rules
+    # with a few vectorized operations per batch of tickets
+    table = build_rule_table(rules)
+    ticket_count, field_count = nearby_tickets.shape
+    error_rate = 0
+    valid = np.zeros(ticket_count, dtype=bool)
+    candidates = np.full((field_count, table.shape[1]), np.iinfo(np.uint64).max, dtype=np.uint64)
+    candidates[:, -1] = (1 << (len(rules) - 64 * (table.shape[1] - 1))) - 1
+
+    for start in range(0, ticket_count, SCAN_BATCH_SIZE):
+        tickets = nearby_tickets[start:start + SCAN_BATCH_SIZE]
+        in_table = (tickets >= 0) & (tickets < len(table))
+        masks = table[np.where(in_table, tickets, 0)]
+        masks[~in_table] = 0
+
+        value_valid = masks.any(axis=2)
+        error_rate += int(tickets[~value_valid].sum())
+        batch_valid = value_valid.all(axis=1)
+        valid[start:start + len(tickets)] = batch_valid
+        if batch_valid.any():
+            candidates &= np.bitwise_and.reduce(masks[batch_valid], axis=0)
+
+    return TicketScan(error_rate, valid, [words_to_mask(words) for words in candidates])
+
+
+def pt1_solution(notes: Tuple[List[Rule], List[int], np.ndarray]) -> int:
+    rules, _, nearby_tickets = notes
+    return scan_tickets(rules, nearby_tickets).error_rate
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+def match_fields(candidates: Dict[int, int]) -> Dict[int, int]:
+    # Hopcroft-Karp maximum matching of columns to rules, where
+    # candidates[column] is the bitmask of rules the column may hold. Returns
+    # {column: rule} for every column it manages to match.
+    rule_to_column: Dict[int, int] = {}
+    column_to_rule: Dict[int, int] = {}
+
+    def find_layers() -> Optional[Dict[int, int]]:
+        # BFS from the free columns, alternating between unmatched and matched
+        # edges; returns each reachable column's distance, or None if no
+        # augmenting path exists
+        distances = {column: 0 for column in candidates if column not in column_to_rule}
+        queue = deque(distances)
+        found_free_rule = False
+        while queue:
+            column = queue.popleft()
+            for rule in iter_bits(candidates[column]):
+                next_column = rule_to_column.get(rule)
+                if next_column is None:
+                    found_free_rule = True
+                elif next_column not in distances:
+                    distances[next_column] = distances[column] + 1
+                    queue.append(next_column)
+
+        return distances if found_free_rule else None
+
+    def augment(column: int, distances: Dict[int, int]) -> bool:
+        # DFS along the BFS layers for a path ending at a free rule, flipping
+        # the matching along it
+        for rule in iter_bits(candidates[column]):
+            next_column = rule_to_column.get(rule)
+            if next_column is None or (
+                distances.get(next_column) == distances[column] + 1 and augment(next_column, distances)
+            ):
+                rule_to_column[rule] = column
+                column_to_rule[column] = rule
+                return True
+
+        distances[column] = -1  # Dead end, don't try it again this phase
+        return False
+
+    while (distances := find_layers()) is not None:
+        for column in candidates:
+            if column not in column_to_rule:
+                augment(column, distances)
+
+    return column_to_rule
+
+
+def resolve_fields(candidates: List[int]) -> List[int]:
+    # Returns which rule every column holds, given each column's candidate
+    # rule bitmask. Columns with a single candidate settle their rule, which
+    # gets struck from every other column, possibly settling more of them
+    # (tracked with a worklist). If that stalls with columns left over, the
+    # rest is an assignment problem, solved as a bipartite matching.
+    candidates = list(candidates)
+    resolved: Dict[int, int] = {}
+    worklist = [column for column, mask in enumerate(candidates) if mask and not mask & (mask - 1)]
+
+    while worklist:
+        column = worklist.pop()
+        if column in resolved:
+            continue
+
+        rule_bit = candidates[column]
+        resolved[column] = rule_bit.bit_length() - 1
+        for other_column, mask in enumerate(candidates):
+            if other_column != column and mask & rule_bit:
+                candidates[other_column] = mask = mask & ~rule_bit
+                if not mask:
+                    raise ValueError(f'Column {other_column} has no rule left that fits it')
+                if not mask & (mask - 1):
+                    worklist.append(other_column)
+
+    unresolved = {column: mask for column, mask in enumerate(candidates) if column not in resolved}
+    if unresolved:
+        matching = match_fields(unresolved)
+        if len(matching) != len(unresolved):
+            raise ValueError(f'No way to give each of columns {sorted(unresolved)} its own rule')
+        resolved.update(matching)
+
+    return [resolved[column] for column in range(len(candidates))]
+
+
+def pt2_solution(notes: Tuple[List[Rule], List[int], np.ndarray]) -> int:
+    rules, my_ticket, nearby_tickets = notes
+
+    # Every valid ticket narrows down which rules each column could be, e.g.
+    # for the sample given on the site the columns end up with the candidate
+    # rules {1}, {0, 1} and {0, 1, 2}, which resolve to rules 1, 0 and 2
+    rule_by_column = resolve_fields(scan_tickets(rules, nearby_tickets).column_candidates)
+
+    # Get fields that start with departure and their mapped values
+    return prod(
+        my_ticket[column]
+        for column, rule_idx in enumerate(rule_by_column)
+        if rules[rule_idx].rule_name.startswith('departure')
+    )
+
+
+if __name__ == "__main__":
+    notes = parse_input()
+    print(f'Part 1: {pt1_solution(notes)}')
+    print(f'Part 2: {pt2_solution(notes)}')
@@ -1,9 +1,16 @@
+import numpy as np
 import operator
+import os
 
 from collections import defaultdict
 from copy import deepcopy
-from itertools import product
-from typing import Set, Tuple
+from itertools import chain, product
+from multiprocessing import Pipe, Process, resource_tracker, shared_memory
+from multiprocessing.connection import Connection
+from typing import List, Optional, Set, Tuple
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
 
 def solve(max_cycles: int, num_dimensions: int, initial_live_set: Set[Tuple]) -> int:
@@ -38,21 +45,274 @@ def solve(max_cycles: int, num_dimensions: int, initial_live_set: Set[Tuple]) ->
 
     return len(live_set)
 
-    
-with open('input') as input_file:
-    initial_world = [l.strip() for l in input_file]
 
-initial_live_set_pt1 = set((x, y, 0) 
-    for y in range(len(initial_world))
-    for x in range(len(initial_world[y]))
-    if initial_world[y][x] == '#'
-)
+# A layer of live cells crossing between shards, as (shared memory block name,
+# cell count), or None when the layer is empty
+HaloRef = Optional[Tuple[str, int]]
+
+
+def export_layer(cells: List[Tuple], num_dimensions: int) -> Optional[shared_memory.SharedMemory]:
+    # Copies the cells into a new shared memory block as an (n, d) int64 array;
+    # the caller owns the block and has to unlink it
+    if not cells:
+        return None
+
+    block = shared_memory.SharedMemory(create=True, size=len(cells) * num_dimensions * 8)
+    np.ndarray((len(cells), num_dimensions), dtype=np.int64, buffer=block.buf)[:] = cells
+    return block
+
+
+def import_layer(ref: HaloRef, num_dimensions: int) -> List[Tuple]:
+    if ref is None:
+        return []
+
+    name, count = ref
+    block = shared_memory.SharedMemory(name=name)
+    cells = list(map(tuple, np.ndarray((count, num_dimensions), dtype=np.int64, buffer=block.buf).tolist()))
+    block.close()
+    return cells
+
+
+def run_shard(
+    conn: Connection,
+    num_dimensions: int,
+    low: Optional[int],
+    high: Optional[int],
+    live_set: Set[Tuple],
+):
+    # Owns the live cells with low <= x < high (None for no bound) and steps
+    # them a cycle at a time on the coordinator's say-so. Each cycle it
+    # publishes its outermost layers for the neighbouring shards, and is sent
+    # back theirs: the only cells outside the slab that can affect it.
+    neighbor_offsets = [
+        t
+        for t in product((-1, 0, 1), repeat=num_dimensions)
+        if not all(v == 0 for v in t)
+    ]
+    exported: List[shared_memory.SharedMemory] = []
+
+    while True:
+        command = conn.recv()
+
+        # Every shard has read last cycle's layers by the time a new command
+        # arrives, so they can go
+        for block in exported:
+            block.close()
+            block.unlink()
+        exported = []
+
+        if command is None:
+            conn.send(len(live_set))
+            return
+
+        low_layer = export_layer([c for c in live_set if c[0] == low], num_dimensions) if low is not None else None
+        high_layer = export_layer([c for c in live_set if c[0] == high - 1], num_dimensions) if high is not None else None
+        exported = [block for block in (low_layer, high_layer) if block is not None]
+        conn.send(tuple(
+            (block.name, block.size // (8 * num_dimensions)) if block is not None else None
+            for block in (low_layer, high_layer)
+        ))
+
+        halo = [cell for ref in conn.recv() for cell in import_layer(ref, num_dimensions)]
+        conn.send(True)
+
+        # Same rules as solve, but only cells inside the slab are counted
+        active_neighbor_count_map = defaultdict(int)
+        for coord in chain(live_set, halo):
+            for offset in neighbor_offsets:
+                neighbor = tuple(map(operator.add, coord, offset))
+                if (low is None or neighbor[0] >= low) and (high is None or neighbor[0] < high):
+                    active_neighbor_count_map[neighbor] += 1
+
+        live_set = {
+            coord
+            for coord, count in active_neighbor_count_map.items()
+            if count == 3 or (count == 2 and coord in live_set)
+        }
+
+
+def solve_sharded(
+    max_cycles: int, num_dimensions: int, initial_live_set: Set[Tuple], jobs: Optional[int] = None
+) -> int:
+    # Same answer as solve, with space cut into slabs along x and each slab
+    # stepped by its own process (jobs=None uses every core). The outer slabs
+    # are open-ended so the world can grow into them; the inner ones are at
+    # least one layer thick, so a shard's halo always comes from the shards
+    # right next to it. Cells only cross between processes as halo layers in
+    # shared memory.
+    if not initial_live_set:
+        return 0
+
+    min_x = min(c[0] for c in initial_live_set)
+    width = max(c[0] for c in initial_live_set) - min_x + 1
+    shard_count = max(1, min(jobs or os.cpu_count() or 1, width))
+    cuts = [min_x + width * i // shard_count for i in range(1, shard_count)]
+    bounds = list(zip([None] + cuts, cuts + [None]))
+
+    # Started before forking, so every shard shares it: blocks attached by one
+    # shard and unlinked by another are only tracked once
+    resource_tracker.ensure_running()
+
+    connections = []
+    processes = []
+    for low, high in bounds:
+        slab_live_set = {
+            c for c in initial_live_set if (low is None or c[0] >= low) and (high is None or c[0] < high)
+        }
+        parent_conn, child_conn = Pipe()
+        process = Process(target=run_shard, args=(child_conn, num_dimensions, low, high, slab_live_set), daemon=True)
+        process.start()
+        # Only the worker holds its end, so a worker that dies shows up as EOF
+        child_conn.close()
+        connections.append(parent_conn)
+        processes.append(process)
+
+    try:
+        for current_cycle in range(0, max_cycles):
+            for conn in connections:
+                conn.send(True)
+            layers = [conn.recv() for conn in connections]
+
+            # A shard's low layer is the halo of the shard below it, and its
+            # high layer that of the shard above
+            for idx, conn in enumerate(connections):
+                below = layers[idx - 1][1] if idx > 0 else None
+                above = layers[idx + 1][0] if idx + 1 < len(layers) else None
+                conn.send([below, above])
+            for conn in connections:
+                conn.recv()
+
+        for conn in connections:
+            conn.send(None)
+        return sum(conn.recv() for conn in connections)
+    finally:
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+
+# Cells are stepped this many slices (along the first axis) at a time, which
+# keeps the box sums' temporaries small next to the grid itself
+SLAB_SIZE = 8
+
+
+def sum_boxes(grid: np.ndarray, folded_axes: int, first_axis: int = 0) -> np.ndarray:
+    # Sums every 3x3x...x3 box of the grid over the axes from first_axis on,
+    # one axis at a time (each pass adds up a cell and its two neighbours
+    # along that axis). Outside the grid is empty, except below 0 on the last
+    # `folded_axes` axes: those only hold coordinates >= 0 and mirror them,
+    # so -1 looks the same as 1.
+    sums = grid.astype(np.uint16)
+    for axis in range(first_axis, grid.ndim):
+        size = sums.shape[axis]
+        edge_shape = sums.shape[:axis] + (1,) + sums.shape[axis + 1:]
+        empty_edge = np.zeros(edge_shape, dtype=sums.dtype)
+        is_folded = axis >= grid.ndim - folded_axes
+        low_edge = np.take(sums, [1], axis=axis) if is_folded and size > 1 else empty_edge
+        padded = np.concatenate((low_edge, sums, empty_edge), axis=axis)
+
+        def window(start: int) -> np.ndarray:
+            index = [slice(None)] * grid.ndim
+            index[axis] = slice(start, start + size)
+            return padded[tuple(index)]
+
+        sums = window(0) + window(1) + window(2)
+
+    return sums
+
+
+def step_dense(grid: np.ndarray, folded_axes: int) -> np.ndarray:
+    # Applies the rules to every cell, a slab of SLAB_SIZE slices at a time.
+    # Each slab sums boxes over the other axes for itself plus one slice on
+    # either side, then finishes the sum along the first axis.
+    next_grid = np.empty_like(grid)
+    slice_count = len(grid)
+    for start in range(0, slice_count, SLAB_SIZE):
+        end = min(slice_count, start + SLAB_SIZE)
+        partial_sums = sum_boxes(grid[max(0, start - 1):end + 1], folded_axes, first_axis=1)
+        empty_slice = np.zeros((1,) + partial_sums.shape[1:], dtype=partial_sums.dtype)
+        partial_sums = np.concatenate(
+            ([empty_slice] if start == 0 else []) + [partial_sums] + ([empty_slice] if end == slice_count else [])
+        )
+        box_sums = partial_sums[:-2] + partial_sums[1:-1] + partial_sums[2:]
+
+        # A cell's own state is in its box sum too, so live cells with 2 or 3
+        # live neighbours have a sum of 3 or 4, and dead ones with 3 have 3
+        next_grid[start:end] = (box_sums == 3) | ((box_sums == 4) & (grid[start:end] == 1))
+
+    return next_grid
+
+
+def crop_to_live_cells(grid: np.ndarray, folded_axes: int) -> np.ndarray:
+    # Trims empty slabs off the grid's bounding box (folded axes keep their 0
+    # index, which is what they're mirrored around)
+    index = []
+    for axis in range(grid.ndim):
+        other_axes = tuple(a for a in range(grid.ndim) if a != axis)
+        live = np.flatnonzero(grid.any(axis=other_axes))
+        if not len(live):
+            return grid[tuple(slice(0, 0) for _ in range(grid.ndim))]
+
+        start = 0 if axis >= grid.ndim - folded_axes else live[0]
+        index.append(slice(start, live[-1] + 1))
+
+    return grid[tuple(index)]
+
+
+def solve_dense(max_cycles: int, num_dimensions: int, initial_world: List[str], fold_symmetry: bool = False) -> int:
+    # Same rules as solve, on a dense grid that grows by a cell on every side
+    # each cycle (after trimming empty space), with neighbours counted by
+    # summing 3^d boxes.
+    #
+    # Every extra dimension (z, w, ...) starts at 0, and the rules don't care
+    # about direction, so the world stays mirror symmetric around 0 on each
+    # of them. With fold_symmetry only coordinates >= 0 are kept for those,
+    # which cuts the work by about 2 per extra dimension.
+    folded_axes = num_dimensions - 2 if fold_symmetry else 0
+    grid = np.array([[c == '#' for c in row] for row in initial_world if row], dtype=np.uint8)
+    grid = grid.reshape(grid.shape + (1,) * (num_dimensions - 2))
+
+    for current_cycle in range(0, max_cycles):
+        grid = crop_to_live_cells(grid, folded_axes)
+        grid = np.pad(grid, [(0, 1) if axis >= num_dimensions - folded_axes else (1, 1) for axis in range(num_dimensions)])
+
+        grid = step_dense(grid, folded_axes)
+
+    # Cells off the 0 plane of a folded axis stand for themselves and their
+    # mirror image, so weight the live counts per folded coordinate
+    live_counts = grid.sum(axis=tuple(range(num_dimensions - folded_axes)), dtype=np.int64)
+    for axis in range(folded_axes):
+        shape = [1] * folded_axes
+        shape[axis] = live_counts.shape[axis]
+        live_counts = live_counts * np.where(np.arange(shape[axis]) > 0, 2, 1).reshape(shape)
+
+    return int(live_counts.sum())
+
+
+def get_initial_live_set(initial_world: List[str], num_dimensions: int) -> Set[Tuple]:
+    # The initial world is a 2D slice; every extra dimension starts at 0
+    return set((x, y) + (0,) * (num_dimensions - 2)
+        for y in range(len(initial_world))
+        for x in range(len(initial_world[y]))
+        if initial_world[y][x] == '#'
+    )
+
+
+def parse_input(path: str = INPUT_PATH) -> List[str]:
+    with open(path) as input_file:
+        return [l.strip() for l in input_file]
+
+
+def pt1_solution(initial_world: List[str]) -> int:
+    return solve_dense(6, 3, initial_world, fold_symmetry=True)
+
+
+def pt2_solution(initial_world: List[str]) -> int:
+    return solve_dense(6, 4, initial_world, fold_symmetry=True)
 
-initial_live_set_pt2 = set((x, y, 0, 0) 
-    for y in range(len(initial_world))
-    for x in range(len(initial_world[y]))
-    if initial_world[y][x] == '#'
-)
 
-print(f'Part 1: {solve(6, 3, initial_live_set_pt1)}')
-print(f'Part 2: {solve(6, 4, initial_live_set_pt2)}')
\ No newline at end of file
+if __name__ == "__main__":
+    initial_world = parse_input()
+    print(f'Part 1: {pt1_solution(initial_world)}')
+    print(f'Part 2: {pt2_solution(initial_world)}')
@@ -1,57 +1,135 @@
 import operator as op
+import os
+import re
 
-from collections import deque
-from typing import Dict, List
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from aoc.inputs import map_chunks
 
-OPERATORS = '+-*/'
 
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
-def convert_to_prefix(expr: str, op_precedences: Dict[str, int]) -> List[str]:
-    expr = expr.replace(' ', '')
+# Whole numbers, or any other single non-space character
+TOKEN_REGEX = re.compile(rb'\d+|\S')
 
-    output = []
-    ops = deque()
+# The operators a precedence table can use; neither puzzle part uses '-',
+# but a custom table can give it a precedence
+BINARY_OPERATIONS = {
+    b'+': op.add,
+    b'-': op.sub,
+    b'*': op.mul,
+}
 
-    for chr in expr:
-        if chr in OPERATORS:
-            if ops and ops[-1] != '(' and op_precedences[ops[-1]] <= op_precedences[chr]:
-                output.append(ops.pop())
+# Precedence tables map operators to how tightly they bind: higher binds
+# tighter, and operators of equal precedence evaluate left to right
+Precedences = Dict[bytes, int]
 
-            ops.append(chr)
-        elif chr == '(':
-            ops.append(chr)
-        elif chr == ')':
-            while (top := ops.pop()) != '(':
-                output.append(top)
-        else:
-            output.append(chr)
+PT1_PRECEDENCES: Precedences = {b'+': 1, b'*': 1}
+PT2_PRECEDENCES: Precedences = {b'+': 2, b'*': 1}
 
-    output.extend(reversed(ops))  # dump the rest of the ops stack
-    return output
 
+def check_precedences(precedences: Precedences):
+    unknown_operators = [operator for operator in precedences if operator not in BINARY_OPERATIONS]
+    if unknown_operators:
+        raise ValueError(f'No operation for {", ".join(repr(o.decode()) for o in unknown_operators)}')
 
-def evaluate_prefix(tokens: List[str]) -> int:
-    vals = []
-    op_map = {
-        '*': op.mul,
-        '+': op.add,
-    }
-    for token in tokens:
-        if token in op_map:
-            value = op_map[token](vals[-2], vals[-1])
-            del vals[-2:]
-            vals.append(value)
-        else:
-            vals.append(int(token))
+
+def tokenize(expr: bytes) -> List[bytes]:
+    return TOKEN_REGEX.findall(expr)
+
+
+def evaluate_tokens(tokens: List[bytes], idx: int, min_precedence: int, precedences: Precedences) -> Tuple[int, int]:
+    # Precedence climbing: evaluates the operand at idx, then keeps folding in
+    # operators that bind at least as tightly as min_precedence. Returns the
+    # value and the index of the first token it didn't use.
+    if idx >= len(tokens):
+        raise ValueError('Expression ends where an operand was expected')
+
+    token = tokens[idx]
+    if token == b'(':
+        value, idx = evaluate_tokens(tokens, idx + 1, 0, precedences)
+        if idx >= len(tokens) or tokens[idx] != b')':
+            raise ValueError('Unbalanced parentheses')
+        idx += 1
+    elif token.isdigit():
+        value = int(token)
+        idx += 1
+    else:
+        raise ValueError(f'Expected an operand, got {token.decode()!r}')
+
+    while idx < len(tokens):
+        operator = tokens[idx]
+        precedence = precedences.get(operator)
+        # Anything that isn't an operator (i.e. a closing parenthesis) ends
+        # this operand; it's up to the caller to check it's allowed there
+        if precedence is None or precedence < min_precedence:
+            break
+
+        # The right operand only takes operators binding tighter than this
+        # one, which is what makes equal precedences associate to the left
+        rhs, idx = evaluate_tokens(tokens, idx + 1, precedence + 1, precedences)
+        value = BINARY_OPERATIONS[operator](value, rhs)
+
+    return value, idx
+
+
+def evaluate_expression(tokens: List[bytes], precedences: Precedences) -> int:
+    value, idx = evaluate_tokens(tokens, 0, 0, precedences)
+    if idx != len(tokens):
+        raise ValueError(f'Unexpected {tokens[idx].decode()!r}')
 
     return value
 
 
-with open('input') as input_file:
-    solutions = [l.strip() for l in input_file]
+def evaluate(expr: str, precedences: Precedences) -> int:
+    check_precedences(precedences)
+    return evaluate_expression(tokenize(expr.encode()), precedences)
+
+
+def sum_chunk(chunk: bytes, precedence_tables: Sequence[Precedences]) -> List[int]:
+    # Sums the chunk's expressions under every precedence table, tokenizing
+    # each line only once
+    totals = [0] * len(precedence_tables)
+    for line in chunk.splitlines():
+        tokens = tokenize(line)
+        if not tokens:
+            continue
+
+        for idx, precedences in enumerate(precedence_tables):
+            totals[idx] += evaluate_expression(tokens, precedences)
+
+    return totals
+
+
+def sum_expressions(path: str, precedence_tables: Sequence[Precedences], jobs: Optional[int] = 1) -> List[int]:
+    # Returns the sum of every expression in the file under each precedence
+    # table, in one pass over the file
+    for precedences in precedence_tables:
+        check_precedences(precedences)
+
+    totals = [0] * len(precedence_tables)
+    for chunk_totals in map_chunks(path, partial(sum_chunk, precedence_tables=precedence_tables), jobs):
+        for idx, total in enumerate(chunk_totals):
+            totals[idx] += total
+
+    return totals
+
+
+def parse_input(path: str = INPUT_PATH) -> str:
+    # The homework is tokenized a chunk at a time while it's being evaluated
+    return path
+
+
+def pt1_solution(path: str) -> int:
+    return sum_expressions(path, [PT1_PRECEDENCES])[0]
+
+
+def pt2_solution(path: str) -> int:
+    return sum_expressions(path, [PT2_PRECEDENCES])[0]
+
 
-pt1_precedence_map = {'+': 1, '*': 1}
-pt2_precedence_map = {'+': 1, '*': 2}
-print(f'Part 1: {sum(evaluate_prefix(convert_to_prefix(s, pt1_precedence_map)) for s in solutions)}')
-print(f'Part 2: {sum(evaluate_prefix(convert_to_prefix(s, pt2_precedence_map)) for s in solutions)}')
+if __name__ == "__main__":
+    pt1_total, pt2_total = sum_expressions(parse_input(), [PT1_PRECEDENCES, PT2_PRECEDENCES])
+    print(f'Part 1: {pt1_total}')
+    print(f'Part 2: {pt2_total}')
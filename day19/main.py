@@ -1,41 +1,35 @@
 import abc
+import os
 import re
 
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List
+from functools import partial
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+# Messages handed to each worker in parallel mode
+PARALLEL_BATCH_SIZE = 10_000
+# Rules whose regex would be longer than this are left to the chart parser:
+# patterns can grow exponentially with the depth of the rules below them
+MAX_PATTERN_LENGTH = 1 << 16
 
 
 class Rule(metaclass=abc.ABCMeta):
 
     @abc.abstractmethod
-    def match(self, text: str) -> List[int]:
-        raise NotImplemented
+    def get_subrule_idxs(self) -> List[int]:
+        raise NotImplementedError
 
 
 @dataclass
 class CompoundRule(Rule):
     subrule_idxs: List[int]
 
-    def match(self, text: str) -> List[int]:
-        # Assumes there's a global rulebook
-        # This stores the number of characters this rule consumes
-        results = []
-
-        # Map indices to the actual rules
-        for rule in map(lambda i: rulebook[i], self.subrule_idxs):
-            if results:           
-                # We need to apply each corresponding subrule to each match
-                # and advance the consumed chars count
-                results = [r + m for r in results for m in rule.match(text[r:])] 
-            else:
-                results = rule.match(text)
-
-            # If, after any rule, we have no results left, we can break out early
-            if not results:
-                return []
-
-        return results
+    def get_subrule_idxs(self) -> List[int]:
+        return self.subrule_idxs
 
 
 @dataclass
@@ -43,30 +37,228 @@ class OrRule(Rule):
     left_clause: CompoundRule
     right_clause: CompoundRule
 
-    def match(self, text: str) -> List[int]:
-        return self.left_clause.match(text) + self.right_clause.match(text)
+    def get_subrule_idxs(self) -> List[int]:
+        return self.left_clause.subrule_idxs + self.right_clause.subrule_idxs
 
 
 @dataclass
 class ConstantRule(Rule):
     constant: str
 
-    def match(self, text: str) -> List[int]:
-        if text.startswith(self.constant):
-            return [1]
-
+    def get_subrule_idxs(self) -> List[int]:
         return []
 
 
-def get_rulebook_and_values() -> Dict[int, Rule]:
+Rulebook = Dict[int, Rule]
+# The parser's memo: the offsets a rule can end at, keyed by (rule, start
+# offset), or None while that entry is still being worked out
+Chart = Dict[Tuple[int, int], Optional[Tuple[int, ...]]]
+
+
+def get_clauses(rule: Rule) -> List[List[int]]:
+    # The sequences of subrules the rule can match, one per alternative
+    if isinstance(rule, OrRule):
+        return [rule.left_clause.subrule_idxs, rule.right_clause.subrule_idxs]
+
+    return [rule.get_subrule_idxs()]
+
+
+def find_regular_rules(rulebook: Rulebook) -> Set[int]:
+    # Returns the rules that can't reach a loop in the rulebook: exactly the
+    # ones that match a finite set of strings, and so compile to a regex
+    regular: Dict[int, Optional[bool]] = {}  # None while a rule is being visited
+
+    def visit(idx: int) -> bool:
+        if idx in regular:
+            # Getting back to a rule that's still being visited means a loop
+            return bool(regular[idx])
+
+        regular[idx] = None
+        regular[idx] = all([visit(subrule_idx) for subrule_idx in rulebook[idx].get_subrule_idxs()])
+        return regular[idx]
+
+    for idx in rulebook:
+        visit(idx)
+
+    return {idx for idx, is_regular in regular.items() if is_regular}
+
+
+class Grammar:
+    """
+    A rulebook compiled for matching whole messages against its start rule.
+
+    Rules that can't reach a loop (and whose pattern stays a sensible size)
+    become precompiled regexes, along with the set of lengths they can match.
+    Everything else, e.g. the looping rules 8 and 11 in part 2, is matched by
+    a parser memoized on (rule, start offset) that returns every offset a
+    rule can end at. Neither ever copies the message: regexes are run over
+    (start, end) windows of it.
+    """
+
+    def __init__(self, rulebook: Rulebook, start_rule: int = 0):
+        self.rulebook = rulebook
+        self.start_rule = start_rule
+        self.regular_rules = find_regular_rules(rulebook)
+        self.pattern_lengths: Dict[int, int] = {}
+        self.patterns: Dict[int, str] = {}
+        self.match_lengths: Dict[int, FrozenSet[int]] = {}
+        self.regexes: Dict[int, re.Pattern] = {}
+
+        # Only rules the parser starts itself get a regex of their own; the
+        # rest are inlined into those. Compiled up front, so workers are
+        # handed a ready-to-use grammar.
+        entry_rules = {start_rule} | {
+            subrule_idx
+            for idx, rule in rulebook.items()
+            if not self.is_compiled(idx)
+            for subrule_idx in rule.get_subrule_idxs()
+        }
+        for idx in entry_rules:
+            if self.is_compiled(idx):
+                self.regexes[idx] = re.compile(self.get_pattern(idx))
+                self.get_match_lengths(idx)
+
+    def get_pattern_length(self, idx: int) -> int:
+        if idx not in self.pattern_lengths:
+            rule = self.rulebook[idx]
+            if isinstance(rule, ConstantRule):
+                length = len(re.escape(rule.constant))
+            else:
+                clauses = get_clauses(rule)
+                length = sum(self.get_pattern_length(i) for clause in clauses for i in clause)
+                if len(clauses) > 1:
+                    length += len('(?:)') + len(clauses) - 1
+
+            self.pattern_lengths[idx] = length
+
+        return self.pattern_lengths[idx]
+
+    def is_compiled(self, idx: int) -> bool:
+        return idx in self.regular_rules and self.get_pattern_length(idx) <= MAX_PATTERN_LENGTH
+
+    def get_pattern(self, idx: int) -> str:
+        if idx not in self.patterns:
+            rule = self.rulebook[idx]
+            if isinstance(rule, ConstantRule):
+                pattern = re.escape(rule.constant)
+            else:
+                alternatives = [''.join(map(self.get_pattern, clause)) for clause in get_clauses(rule)]
+                pattern = alternatives[0] if len(alternatives) == 1 else f'(?:{"|".join(alternatives)})'
+
+            self.patterns[idx] = pattern
+
+        return self.patterns[idx]
+
+    def get_match_lengths(self, idx: int) -> FrozenSet[int]:
+        # The lengths of the strings a regular rule matches
+        if idx not in self.match_lengths:
+            rule = self.rulebook[idx]
+            if isinstance(rule, ConstantRule):
+                lengths = frozenset([len(rule.constant)])
+            else:
+                lengths = frozenset()
+                for clause in get_clauses(rule):
+                    clause_lengths = frozenset([0])
+                    for subrule_idx in clause:
+                        clause_lengths = frozenset(a + b for a in clause_lengths for b in self.get_match_lengths(subrule_idx))
+                    lengths |= clause_lengths
+
+            self.match_lengths[idx] = lengths
+
+        return self.match_lengths[idx]
+
+    def match_clause(self, clause: List[int], message: str, start: int, chart: Chart) -> Set[int]:
+        ends = {start}
+        for subrule_idx in clause:
+            ends = {end for offset in ends for end in self.match_rule(subrule_idx, message, offset, chart)}
+            if not ends:
+                break
+
+        return ends
+
+    def match_rule(self, idx: int, message: str, start: int, chart: Chart) -> Tuple[int, ...]:
+        # Returns every offset the rule can stop at when started at `start`
+        regex = self.regexes.get(idx)
+        if regex is not None:
+            return tuple(
+                start + length
+                for length in self.match_lengths[idx]
+                if start + length <= len(message) and regex.fullmatch(message, start, start + length)
+            )
+
+        rule = self.rulebook[idx]
+        if isinstance(rule, ConstantRule):
+            return (start + len(rule.constant),) if message.startswith(rule.constant, start) else ()
+
+        key = (idx, start)
+        if key in chart:
+            if chart[key] is None:
+                raise ValueError(f'Rule {idx} is left-recursive')
+            return chart[key]
+
+        chart[key] = None
+        ends: Set[int] = set()
+        for clause in get_clauses(rule):
+            ends |= self.match_clause(clause, message, start, chart)
+        chart[key] = tuple(ends)
+        return chart[key]
+
+    def matches(self, message: str) -> bool:
+        regex = self.regexes.get(self.start_rule)
+        if regex is not None:
+            return regex.fullmatch(message) is not None
+
+        return len(message) in self.match_rule(self.start_rule, message, 0, {})
+
+
+def count_matches_in_batch(grammars: Sequence[Grammar], messages: List[str]) -> List[int]:
+    return [sum(map(grammar.matches, messages)) for grammar in grammars]
+
+
+def iter_batches(messages: List[str], batch_size: int) -> Iterator[List[str]]:
+    for start in range(0, len(messages), batch_size):
+        yield messages[start:start + batch_size]
+
+
+def count_matches(grammars: Sequence[Grammar], messages: List[str], jobs: Optional[int] = 1) -> List[int]:
+    # Returns how many messages each grammar matches. With jobs other than 1
+    # the messages are split into batches that a process pool works through
+    # (jobs=None uses every core), each checked against every grammar.
+    if jobs == 1:
+        return count_matches_in_batch(grammars, messages)
+
+    totals = [0] * len(grammars)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for batch_totals in executor.map(partial(count_matches_in_batch, grammars), iter_batches(messages, PARALLEL_BATCH_SIZE)):
+            for idx, total in enumerate(batch_totals):
+                totals[idx] += total
+
+    return totals
+
+
+def get_looping_rulebook(rulebook: Rulebook) -> Rulebook:
+    # Part 2's rulebook, where rules 8 and 11 loop
+    looping_rulebook = dict(rulebook)
+    looping_rulebook[8] = OrRule(
+        left_clause=CompoundRule([42]),
+        right_clause=CompoundRule([42, 8])
+    )
+    looping_rulebook[11] = OrRule(
+        left_clause=CompoundRule([42, 31]),
+        right_clause=CompoundRule([42, 11, 31])
+    )
+    return looping_rulebook
+
+
+def get_rulebook_and_values(path: str = INPUT_PATH) -> Tuple[Rulebook, List[str]]:
     compound_rule_regex = re.compile(r'^(\d+): ([\d ]+)$')
     or_rule_regex = re.compile(r'^(\d+): ([\d ]+) \| ([\d ]+)$')
     constant_rule_regex = re.compile(r'^(\d+): "(\w)"$')
 
-    with open('input') as input_file:
+    with open(path) as input_file:
         rule_lines, values = input_file.read().split('\n\n')
         rule_lines = [s.strip() for s in rule_lines.split('\n')]
-        values = [s.strip() for s in values.split('\n')]
+        values = [s.strip() for s in values.split('\n') if s.strip()]
 
     rulebook = {}
     for l in rule_lines:
@@ -82,26 +274,21 @@ def get_rulebook_and_values() -> Dict[int, Rule]:
     return rulebook, values
 
 
-def get_total_matches(rulebook: Dict[int, Rule], values: List[str]) -> int:
-    total_matches = 0
-    for v in values:
-        results = rulebook[0].match(v)
-        if any(chars_consumed == len(v) for chars_consumed in results):
-            total_matches += 1
-    return total_matches
+def parse_input(path: str = INPUT_PATH) -> Tuple[Rulebook, List[str]]:
+    return get_rulebook_and_values(path)
 
 
-if __name__ == "__main__":
-    rulebook, values = get_rulebook_and_values()
-    print(f'Part 1: {get_total_matches(rulebook, values)}')
+def pt1_solution(puzzle: Tuple[Rulebook, List[str]]) -> int:
+    rulebook, values = puzzle
+    return count_matches([Grammar(rulebook)], values)[0]
 
-    # Update rulebook for pt 2
-    rulebook[8] = OrRule(
-        left_clause=CompoundRule([42]),
-        right_clause=CompoundRule([42, 8])
-    )
-    rulebook[11] = OrRule(
-        left_clause=CompoundRule([42, 31]),
-        right_clause=CompoundRule([42, 11, 31])
-    )
-    print(f'Part 2: {get_total_matches(rulebook, values)}')
\ No newline at end of file
+
+def pt2_solution(puzzle: Tuple[Rulebook, List[str]]) -> int:
+    rulebook, values = puzzle
+    return count_matches([Grammar(get_looping_rulebook(rulebook))], values)[0]
+
+
+if __name__ == "__main__":
+    puzzle = parse_input()
+    print(f'Part 1: {pt1_solution(puzzle)}')
+    print(f'Part 2: {pt2_solution(puzzle)}')
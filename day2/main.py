@@ -1,33 +1,119 @@
-from collections import Counter
+import numpy as np
+import os
+
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
+
+from aoc.inputs import map_chunks
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
 
 @dataclass
-class PasswordPolicy:
-    min_token: int
-    max_token: int
-    required_char: str
+class PasswordColumns:
+    """
+    A chunk of 'min-max char: password' lines, parsed into one array per
+    field. Passwords aren't copied out: password_starts/password_ends are
+    offsets into the chunk's own bytes.
+    """
+
+    data: np.ndarray  # The chunk, as uint8
+    min_tokens: np.ndarray
+    max_tokens: np.ndarray
+    required_chars: np.ndarray
+    password_starts: np.ndarray
+    password_ends: np.ndarray
+
+
+def parse_numbers(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Parses the decimal numbers in data[starts[i]:ends[i]], one digit
+    # position at a time across every number at once
+    lengths = ends - starts
+    numbers = np.zeros(len(starts), dtype=np.int64)
+    for digit in range(lengths.max(initial=0)):
+        has_digit = lengths > digit
+        numbers[has_digit] = numbers[has_digit] * 10 + (data[starts[has_digit] + digit] - ord('0'))
+
+    return numbers
+
+
+def parse_columns(chunk: bytes) -> PasswordColumns:
+    data = np.frombuffer(chunk if chunk.endswith(b'\n') else chunk + b'\n', dtype=np.uint8)
+
+    # Every line has exactly one '-' and one ':' (passwords are letters), which
+    # pins down where every field starts and ends
+    line_ends = np.flatnonzero(data == ord('\n'))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    non_blank = line_ends > line_starts
+    line_starts, line_ends = line_starts[non_blank], line_ends[non_blank]
+    dashes = np.flatnonzero(data == ord('-'))
+    colons = np.flatnonzero(data == ord(':'))
+
+    return PasswordColumns(
+        data=data,
+        min_tokens=parse_numbers(data, line_starts, dashes),
+        max_tokens=parse_numbers(data, dashes + 1, colons - 2),
+        required_chars=data[colons - 1],
+        password_starts=colons + 2,
+        password_ends=line_ends,
+    )
+
+
+def count_valid_passwords_in_chunk(chunk: bytes) -> Tuple[int, int]:
+    # Returns how many passwords in the chunk are valid under each policy
+    columns = parse_columns(chunk)
+    data = columns.data
+    password_lengths = columns.password_ends - columns.password_starts
+    line_count = len(password_lengths)
+    if not line_count:
+        return 0, 0
+
+    # Part 1: count the required char in each password by comparing every
+    # password byte with its line's char, then summing the hits per line
+    line_idxs = np.repeat(np.arange(line_count), password_lengths)
+    password_idxs = np.arange(len(line_idxs)) - np.repeat(np.cumsum(password_lengths) - password_lengths, password_lengths)
+    hits = data[columns.password_starts[line_idxs] + password_idxs] == columns.required_chars[line_idxs]
+    char_counts = np.bincount(line_idxs, weights=hits, minlength=line_count)
+    valid_pt1 = (columns.min_tokens <= char_counts) & (char_counts <= columns.max_tokens)
+
+    # Part 2: exactly one of the two (1-indexed) positions holds the char;
+    # positions past the end of the password never match
+    def char_at(positions: np.ndarray) -> np.ndarray:
+        in_range = (positions >= 1) & (positions <= password_lengths)
+        offsets = np.where(in_range, columns.password_starts + positions - 1, 0)
+        return in_range & (data[offsets] == columns.required_chars)
+
+    valid_pt2 = char_at(columns.min_tokens) ^ char_at(columns.max_tokens)
+
+    return int(valid_pt1.sum()), int(valid_pt2.sum())
+
 
+def count_valid_passwords(path: str, jobs: Optional[int] = 1) -> Tuple[int, int]:
+    # Returns how many passwords are valid under the part 1 and part 2
+    # policies, in one pass over the file
+    pt1_total, pt2_total = 0, 0
+    for pt1_count, pt2_count in map_chunks(path, count_valid_passwords_in_chunk, jobs):
+        pt1_total += pt1_count
+        pt2_total += pt2_count
 
-def tokenize(line: str) -> Tuple[PasswordPolicy, str]:
-    raw_tokens = line.split()
-    policy = PasswordPolicy(*map(int, raw_tokens[0].split('-')), raw_tokens[1][0])
-    password = raw_tokens[2]
-    
-    return policy, password
+    return pt1_total, pt2_total
 
 
-def is_valid_password_pt1(policy: PasswordPolicy, password: str) -> bool:
-    return policy.min_token <= Counter(password)[policy.required_char] <= policy.max_token
+def parse_input(path: str = INPUT_PATH) -> str:
+    # The password dump is parsed a chunk at a time while it's being checked
+    return path
 
 
-def is_valid_password_pt2(policy: PasswordPolicy, password: str) -> bool:
-    return (password[policy.min_token-1] == policy.required_char) ^ (password[policy.max_token-1] == policy.required_char)
+def pt1_solution(path: str) -> int:
+    return count_valid_passwords(path)[0]
 
 
-with open('input') as input_file:
-    lines = input_file.readlines()
+def pt2_solution(path: str) -> int:
+    return count_valid_passwords(path)[1]
 
 
-print('Part 1: ', [is_valid_password_pt1(*tokenize(line)) for line in lines].count(True))
-print('Part 2: ', [is_valid_password_pt2(*tokenize(line)) for line in lines].count(True))
\ No newline at end of file
+if __name__ == "__main__":
+    pt1_count, pt2_count = count_valid_passwords(parse_input())
+    print('Part 1: ', pt1_count)
+    print('Part 2: ', pt2_count)
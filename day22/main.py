@@ -1,5 +1,13 @@
+import os
+
 from collections import deque
 from copy import deepcopy
+from typing import List, Tuple
+
+from aoc.inputs import iter_records
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
 
 def calculate_score(deck):
@@ -49,13 +57,23 @@ def play_game_pt2(p1_deck, p2_deck):
     return (0, p1_deck) if p1_deck else (1, p2_deck)
 
 
-with open('input') as input_file:
-    player_decks = [l.split('\n') for l in input_file.read().split('\n\n')]
+def parse_input(path: str = INPUT_PATH) -> Tuple[List[int], List[int]]:
+    # Each record is a 'Player N:' header followed by that player's cards
+    p1_record, p2_record = iter_records(path)
+    return list(map(int, p1_record[1:])), list(map(int, p2_record[1:]))
+
+
+def pt1_solution(decks: Tuple[List[int], List[int]]) -> int:
+    return max(play_game_pt1(*decks))
+
 
-p1_deck = list(map(int, player_decks[0][1:]))
-p2_deck = list(map(int, player_decks[1][1:]))
+def pt2_solution(decks: Tuple[List[int], List[int]]) -> int:
+    # play_game_pt2 plays the game in place, so hand it copies of the decks
+    _, winning_deck = play_game_pt2(*map(list, decks))
+    return calculate_score(winning_deck)
 
-print(f'Part 1: {max(play_game_pt1(p1_deck, p2_deck))}')
 
-_, winning_deck = play_game_pt2(p1_deck, p2_deck)
-print(f'Part 2: {calculate_score(winning_deck)}')
+if __name__ == "__main__":
+    decks = parse_input()
+    print(f'Part 1: {pt1_solution(decks)}')
+    print(f'Part 2: {pt2_solution(decks)}')
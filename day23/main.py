@@ -1,7 +1,13 @@
+import os
+
 from collections import deque
 from copy import deepcopy
 from itertools import chain
 from operator import attrgetter
+from typing import List
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
 
 class CupNode:
@@ -98,17 +104,27 @@ def play_game(cups, final_turn):
     return cups
 
 
-with open('input') as input_file:
-    cups = list(map(int, input_file.readline().strip()))
+def parse_input(path: str = INPUT_PATH) -> List[int]:
+    with open(path) as input_file:
+        return list(map(int, input_file.readline().strip()))
+
+
+def pt1_solution(cups: List[int]) -> str:
+    cupset = CupSet(cups)
+    play_game(cupset, 100)
+    cupset.advance_until_value(1)
+    return "".join(map(str, list(cupset.values())[1:]))
+
+
+def pt2_solution(cups: List[int]) -> int:
+    p2_cups = list(chain(cups, range(max(cups) + 1, 1000001)))
+    cupset = CupSet(p2_cups)
+    play_game(cupset, 10000000)
+    cupset.advance_until_value(1)
+    return cupset.head.next.val * cupset.head.next.next.val
 
-cupset = CupSet(cups)
-pt1_result = play_game(cupset, 100)
-cupset.advance_until_value(1)
-print(f'Part 1: {"".join(map(str, list(cupset.values())[1:]))}')
 
-p2_cups = list(chain(cups, range(max(cups) + 1, 1000001)))
-cupset = CupSet(p2_cups)
-pt2_result = play_game(cupset, 10000000)
-cupset.advance_until_value(1)
-result = cupset.head.next.val * cupset.head.next.next.val
-print(f'Part 2: {result}')
\ No newline at end of file
+if __name__ == "__main__":
+    cups = parse_input()
+    print(f'Part 1: {pt1_solution(cups)}')
+    print(f'Part 2: {pt2_solution(cups)}')
@@ -1,10 +1,14 @@
+import os
 import regex
 
 from collections import deque
 from copy import deepcopy
 from functools import lru_cache
+from typing import List, Set, Tuple
 
 
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
 NEIGHBOR_DIRECTIONS = {
     'e': (1, -1, 0),
     'se': (0, -1, 1),
@@ -28,35 +32,54 @@ def neighbors(coord):
 
 
 input_regex = regex.compile(r'(e|se|sw|w|nw|ne)+')
-with open('input') as input_file:
-    flip_dirs = [input_regex.match(s.strip()).captures(1) for s in input_file]
-
-black_tiles = set()
-for flips in flip_dirs:
-    # Converts each 'movement' into an offset vector and sums them up into a new tuple
-    tile_pos = tuple(sum(col) for col in zip(*map(lambda d: NEIGHBOR_DIRECTIONS[d], flips)))
-
-    if tile_pos in black_tiles:
-        black_tiles.remove(tile_pos)
-    else:
-        black_tiles.add(tile_pos)
-
-print(f'Part 1: {len(black_tiles)}')
-
-day = 0
-while (day := day + 1) <= 100:
-    tiles_to_process = set(black_tiles)
-    for coord in black_tiles:
-        tiles_to_process.update(neighbors(coord))
-
-    new_black_tiles = set()
-    for coord in tiles_to_process:
-        num_adjacent_black_tiles = sum(1 for c in neighbors(coord) if c in black_tiles)
-        if num_adjacent_black_tiles == 2 and coord not in black_tiles:
-            new_black_tiles.add(coord)
-        elif num_adjacent_black_tiles in (1, 2) and coord in black_tiles:
-            new_black_tiles.add(coord)
-
-    black_tiles = new_black_tiles
-
-print(f'Part 2: {len(black_tiles)}')
+
+
+def parse_input(path: str = INPUT_PATH) -> List[List[str]]:
+    with open(path) as input_file:
+        return [input_regex.match(s.strip()).captures(1) for s in input_file]
+
+
+def get_black_tiles(flip_dirs: List[List[str]]) -> Set[Tuple[int, int, int]]:
+    black_tiles = set()
+    for flips in flip_dirs:
+        # Converts each 'movement' into an offset vector and sums them up into a new tuple
+        tile_pos = tuple(sum(col) for col in zip(*map(lambda d: NEIGHBOR_DIRECTIONS[d], flips)))
+
+        if tile_pos in black_tiles:
+            black_tiles.remove(tile_pos)
+        else:
+            black_tiles.add(tile_pos)
+
+    return black_tiles
+
+
+def pt1_solution(flip_dirs: List[List[str]]) -> int:
+    return len(get_black_tiles(flip_dirs))
+
+
+def pt2_solution(flip_dirs: List[List[str]]) -> int:
+    black_tiles = get_black_tiles(flip_dirs)
+
+    day = 0
+    while (day := day + 1) <= 100:
+        tiles_to_process = set(black_tiles)
+        for coord in black_tiles:
+            tiles_to_process.update(neighbors(coord))
+
+        new_black_tiles = set()
+        for coord in tiles_to_process:
+            num_adjacent_black_tiles = sum(1 for c in neighbors(coord) if c in black_tiles)
+            if num_adjacent_black_tiles == 2 and coord not in black_tiles:
+                new_black_tiles.add(coord)
+            elif num_adjacent_black_tiles in (1, 2) and coord in black_tiles:
+                new_black_tiles.add(coord)
+
+        black_tiles = new_black_tiles
+
+    return len(black_tiles)
+
+
+if __name__ == "__main__":
+    flip_dirs = parse_input()
+    print(f'Part 1: {pt1_solution(flip_dirs)}')
+    print(f'Part 2: {pt2_solution(flip_dirs)}')
@@ -1,3 +1,11 @@
+import os
+
+from typing import Tuple
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+
 def transform_subject_number(subject_number, loop_size):
     return pow(subject_number, loop_size, 20201227)
 
@@ -10,9 +18,19 @@ def find_loop_size(pub_key, subject_number):
     return loop_size
 
 
-with open('input') as input_file:
-    card_public_key, door_public_key = [int(l.strip()) for l in input_file]
+def parse_input(path: str = INPUT_PATH) -> Tuple[int, int]:
+    with open(path) as input_file:
+        card_public_key, door_public_key = [int(l.strip()) for l in input_file]
+
+    return card_public_key, door_public_key
+
+
+def pt1_solution(public_keys: Tuple[int, int]) -> int:
+    card_public_key, door_public_key = public_keys
+    door_loop_size = find_loop_size(door_public_key, 7)
+    return transform_subject_number(card_public_key, door_loop_size)
+
 
-door_loop_size = find_loop_size(door_public_key, 7)
-encryption_key = transform_subject_number(card_public_key, door_loop_size)
-print(f'Part 1: {encryption_key}')
\ No newline at end of file
+if __name__ == "__main__":
+    public_keys = parse_input()
+    print(f'Part 1: {pt1_solution(public_keys)}')
@@ -1,34 +1,72 @@
-from functools import partial, reduce
-from typing import List, Tuple
+import numpy as np
+import os
 
+from collections import defaultdict
+from math import prod
+from typing import List, Sequence, Tuple
 
-def generate_coordinates(slope: Tuple[int, int], max_y: int) -> Tuple[int, int]:
-    x, y = slope
-    while y < max_y:
-        yield x, y
-        x += slope[0]
-        y += slope[1]
+from aoc.inputs import iter_lines
 
 
-def is_tree_at_location(tile: List[str], x: int, y: int) -> bool:
-    return tile[y][x % len(tile[y])] == '#'
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
+# Upper bound on how many (slope, step) positions get looked up at once, so
+# sweeping thousands of slopes over a tall map doesn't blow up memory
+MAX_BATCH_POSITIONS = 1 << 22
 
-def count_trees(tile: List[str], slope: Tuple[int, int]) -> int:
-    return sum(is_tree_at_location(tile, x, y) for x, y in generate_coordinates(slope, max_y=len(tile)))
 
+def count_trees_for_slopes(trees: np.ndarray, slopes: Sequence[Tuple[int, int]]) -> List[int]:
+    # Counts the trees hit by every (right, down) slope, starting from the top
+    # left and stopping once we're past the bottom of the map. Slopes with the
+    # same 'down' visit the same rows, so each of those groups is looked up
+    # as one (slope x step) index matrix.
+    height, width = trees.shape
+    slope_idxs_by_down = defaultdict(list)
+    for idx, (_, down) in enumerate(slopes):
+        slope_idxs_by_down[down].append(idx)
 
-tile: List[str]
-with open('input') as input_file:
-    tile = [l.strip() for l in input_file]
+    counts = [0] * len(slopes)
+    for down, slope_idxs in slope_idxs_by_down.items():
+        rows = np.arange(down, height, down)
+        steps = np.arange(1, len(rows) + 1)
+        batch_size = max(1, MAX_BATCH_POSITIONS // max(1, len(rows)))
 
-print(f'Part 1: {count_trees(tile, (3, 1))}')
+        for batch_start in range(0, len(slope_idxs), batch_size):
+            batch = slope_idxs[batch_start:batch_start + batch_size]
+            rights = np.array([slopes[i][0] for i in batch], dtype=np.int64)
+            columns = np.outer(rights, steps) % width
+            for idx, count in zip(batch, trees[rows, columns].sum(axis=1)):
+                counts[idx] = int(count)
 
-slopes = [
-    (1, 1),
-    (3, 1),
-    (5, 1),
-    (7, 1),
-    (1, 2),
-]
-print(f'Part 2: {reduce(lambda x, y: x*y, map(partial(count_trees, tile), slopes))}')
+    return counts
+
+
+def count_trees(trees: np.ndarray, slope: Tuple[int, int]) -> int:
+    return count_trees_for_slopes(trees, [slope])[0]
+
+
+def parse_input(path: str = INPUT_PATH) -> np.ndarray:
+    # The map as a (height, width) array of booleans, True where there's a tree
+    rows = [l for l in iter_lines(path) if l]
+    return np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1) == ord('#')
+
+
+def pt1_solution(trees: np.ndarray) -> int:
+    return count_trees(trees, (3, 1))
+
+
+def pt2_solution(trees: np.ndarray) -> int:
+    slopes = [
+        (1, 1),
+        (3, 1),
+        (5, 1),
+        (7, 1),
+        (1, 2),
+    ]
+    return prod(count_trees_for_slopes(trees, slopes))
+
+
+if __name__ == "__main__":
+    trees = parse_input()
+    print(f'Part 1: {pt1_solution(trees)}')
+    print(f'Part 2: {pt2_solution(trees)}')
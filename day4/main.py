@@ -1,63 +1,109 @@
+import os
 import re
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Callable, Optional, Tuple
 
+from aoc.inputs import map_chunks
 
-def validate_height(s):
-    match = re.match(r'(\d+)(cm|in)', s)
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+# Passports are separated by blank lines
+RECORD_SEPARATOR = b'\n\n'
+
+YEAR_PATTERN = re.compile(rb'\d{4}')
+HEIGHT_PATTERN = re.compile(rb'(\d+)(cm|in)')
+HAIR_COLOR_PATTERN = re.compile(rb'#[\da-f]{6}')
+PASSPORT_ID_PATTERN = re.compile(rb'\d{9}')
+VALID_EYE_COLORS = frozenset([b'amb', b'blu', b'brn', b'gry', b'grn', b'hzl', b'oth'])
+
+
+def year_validator(min_year: int, max_year: int) -> Callable[[bytes], bool]:
+    def validate_year(s: bytes) -> bool:
+        return bool(YEAR_PATTERN.fullmatch(s)) and min_year <= int(s) <= max_year
+
+    return validate_year
+
+
+def validate_height(s: bytes) -> bool:
+    match = HEIGHT_PATTERN.fullmatch(s)
     if not match:
         return False
-        
-    height, unit = match.groups()    
-    if unit == 'cm':
+
+    height, unit = match.groups()
+    if unit == b'cm':
         return 150 <= int(height) <= 193
-    elif unit == 'in':
+    else:
         return 59 <= int(height) <= 76
 
 
-VALID_EYE_COLORS = frozenset(['amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth'])
 VALIDATORS = {
-    'byr': lambda s: int(s) and 1920 <= int(s) <= 2002,
-    'iyr': lambda s: int(s) and 2010 <= int(s) <= 2020,
-    'eyr': lambda s: int(s) and 2020 <= int(s) <= 2030,
-    'hgt': validate_height,
-    'hcl': lambda s: bool(re.match(r'#[\da-f]{6}', s)),
-    'ecl': lambda s: s in VALID_EYE_COLORS,
-    'pid': lambda s: len(s) == 9 and s.isdigit(),
-    'cid': lambda s: True,
+    b'byr': year_validator(1920, 2002),
+    b'iyr': year_validator(2010, 2020),
+    b'eyr': year_validator(2020, 2030),
+    b'hgt': validate_height,
+    b'hcl': lambda s: bool(HAIR_COLOR_PATTERN.fullmatch(s)),
+    b'ecl': lambda s: s in VALID_EYE_COLORS,
+    b'pid': lambda s: bool(PASSPORT_ID_PATTERN.fullmatch(s)),
+    b'cid': lambda s: True,
 }
 
+# One bit per field, so checking for the required fields is a single compare
+FIELD_BITS = {field: 1 << i for i, field in enumerate(VALIDATORS)}
+REQUIRED_FIELDS_MASK = sum(FIELD_BITS.values()) & ~FIELD_BITS[b'cid']
+
+
+def check_passport(record: bytes) -> Tuple[bool, bool]:
+    # Returns whether the passport is valid under the part 1 (required fields
+    # are present) and part 2 (...and all of them hold valid values) rules
+    seen_fields = 0
+    values_valid = True
+    for kvp in record.split():
+        key, _, value = kvp.partition(b':')
+        seen_fields |= FIELD_BITS[key]
+        if values_valid and not VALIDATORS[key](value):
+            values_valid = False
+
+    has_required_fields = seen_fields & REQUIRED_FIELDS_MASK == REQUIRED_FIELDS_MASK
+    return has_required_fields, has_required_fields and values_valid
+
+
+def count_valid_passports_in_chunk(chunk: bytes) -> Tuple[int, int]:
+    pt1_count, pt2_count = 0, 0
+    for record in chunk.split(RECORD_SEPARATOR):
+        valid_pt1, valid_pt2 = check_passport(record)
+        pt1_count += valid_pt1
+        pt2_count += valid_pt2
+
+    return pt1_count, pt2_count
 
-def tokenize(line: str) -> Tuple[str, str]:
-    for kvp in line.split():
-        yield tuple(kvp.split(':'))
 
+def count_valid_passports(path: str, jobs: Optional[int] = 1) -> Tuple[int, int]:
+    # Returns how many passports are valid under the part 1 and part 2 rules,
+    # in one pass over the file. Chunks always end on a blank line, so no
+    # passport is split across two of them.
+    pt1_total, pt2_total = 0, 0
+    for pt1_count, pt2_count in map_chunks(path, count_valid_passports_in_chunk, jobs, RECORD_SEPARATOR):
+        pt1_total += pt1_count
+        pt2_total += pt2_count
 
-def is_valid_passport_pt1(passport: Dict[str, str]) -> bool:
-    missing_fields = set(VALIDATORS.keys()).difference(passport.keys())
-    
-    return not missing_fields or missing_fields == {'cid'}
+    return pt1_total, pt2_total
 
 
-def is_valid_passport_pt2(passport: Dict[str, str]) -> bool:
-    return is_valid_passport_pt1(passport) and all(VALIDATORS[k](v) for k, v in passport.items())
+def parse_input(path: str = INPUT_PATH) -> str:
+    # Passports are parsed a chunk at a time while they're being checked
+    return path
 
 
-passports: List[Dict[str, str]] = []
-with open('input') as input_file:
-    current_passport = []
+def pt1_solution(path: str) -> int:
+    return count_valid_passports(path)[0]
 
-    for line in input_file:
-        line = line.strip()
 
-        if not line:
-            passports.append(dict(current_passport))
-            current_passport = []
-        else:
-            current_passport.extend(tokenize(line.strip()))
+def pt2_solution(path: str) -> int:
+    return count_valid_passports(path)[1]
 
-    passports.append(dict(current_passport))
 
-print(f'Part 1: {[is_valid_passport_pt1(p) for p in passports].count(True)}')
-print(f'Part 2: {[is_valid_passport_pt2(p) for p in passports].count(True)}')
\ No newline at end of file
+if __name__ == "__main__":
+    pt1_count, pt2_count = count_valid_passports(parse_input())
+    print(f'Part 1: {pt1_count}')
+    print(f'Part 2: {pt2_count}')
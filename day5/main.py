@@ -1,41 +1,53 @@
-from operator import attrgetter
-from typing import List
-
-
-class BoardingPass:
-    """
-    The boarding pass row can be determined by representing the "row bits" of the
-    pass (first 7 characters) and the "column bits" (next 3 characters) as binary
-    (F/L -> 0, B/R -> 1).
-    """
-
-    def __init__(self, boarding_pass: str):
-        self._boarding_pass_str = boarding_pass
-        self._boarding_pass_as_binary_str = boarding_pass.replace('F', '0').replace('B', '1').replace('L', '0').replace('R', '1')
-    
-    @property
-    def row(self):
-        return int(self._boarding_pass_as_binary_str[:7], 2)
-
-    @property
-    def column(self):
-        return int(self._boarding_pass_as_binary_str[7:], 2)
-    
-    @property
-    def seat_id(self):
-        return 8 * self.row + self.column
-
-
-boarding_passes: List[str] 
-with open('input') as input_file:
-    boarding_passes = [BoardingPass(l.strip()) for l in input_file.readlines()]
-
-print(f"Part 1: {max(map(attrgetter('seat_id'), boarding_passes))}")
-
-# Find hole in range
-sorted_seat_ids = sorted(map(attrgetter('seat_id'), boarding_passes))
-for idx in range(len(sorted_seat_ids) - 1):
-    if sorted_seat_ids[idx + 1] != sorted_seat_ids[idx] + 1:
-        print(f"Part 2: {sorted_seat_ids[idx] + 1}")
-        break
-    
\ No newline at end of file
+import numpy as np
+import os
+
+from typing import Optional
+
+from aoc.inputs import iter_chunks
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+SEAT_COUNT = 1 << 10
+
+# The boarding pass row can be determined by representing the "row bits" of the
+# pass (first 7 characters) and the "column bits" (next 3 characters) as binary
+# (F/L -> 0, B/R -> 1). Read as one 10 bit number that's already 8 * row + column.
+SEAT_BITS_TABLE = bytes.maketrans(b'FBLR', b'0101')
+
+
+def decode_seat_ids(chunk: bytes) -> np.ndarray:
+    # Every boarding pass in the chunk, as seat ids
+    binary_passes = chunk.translate(SEAT_BITS_TABLE).split()
+    return np.fromiter((int(p, 2) for p in binary_passes), dtype=np.uint16, count=len(binary_passes))
+
+
+def get_occupied_seats(path: str) -> np.ndarray:
+    # One flag per seat id, set if any boarding pass is for that seat. Passes
+    # are decoded a chunk at a time, so memory use doesn't depend on the size
+    # of the feed (and scanning the same pass twice is harmless).
+    occupied = np.zeros(SEAT_COUNT, dtype=bool)
+    for chunk in iter_chunks(path):
+        occupied[decode_seat_ids(chunk)] = True
+
+    return occupied
+
+
+def parse_input(path: str = INPUT_PATH) -> np.ndarray:
+    return get_occupied_seats(path)
+
+
+def pt1_solution(occupied: np.ndarray) -> int:
+    return int(np.flatnonzero(occupied)[-1])
+
+
+def pt2_solution(occupied: np.ndarray) -> Optional[int]:
+    # Our seat is the empty one with taken seats on both sides
+    holes = np.flatnonzero(~occupied[1:-1] & occupied[:-2] & occupied[2:]) + 1
+    return int(holes[0]) if len(holes) else None
+
+
+if __name__ == "__main__":
+    occupied = parse_input()
+    print(f"Part 1: {pt1_solution(occupied)}")
+    print(f"Part 2: {pt2_solution(occupied)}")
@@ -1,20 +1,62 @@
-from collections import Counter
-from itertools import chain
-from typing import List
+import os
 
+from typing import List, Tuple
 
-groups: List[List[str]]
-with open('input') as input_file:
-    groups = [group.split() for group in input_file.read().split('\n\n')]
+from aoc.inputs import iter_records
 
-print(f'Part 1: {sum(len(set(chain.from_iterable(g))) for g in groups)}')
 
-sum: int = 0
-for group in groups:
-    # Count up how many people have answered each question per group
-    counter = Counter(chain.from_iterable(group))
-    
-    # ...and sum up how many questions have been answered by everyone in the group
-    sum += len([c for c in counter.values() if c == len(group)])
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
-print(f'Part 2: {sum}')
\ No newline at end of file
+# Questions a-z map onto bits 0-25 of a person's answer mask
+ANSWER_BITS = {ord(c): 1 << i for i, c in enumerate('abcdefghijklmnopqrstuvwxyz')}
+ALL_ANSWERS = (1 << len(ANSWER_BITS)) - 1
+
+
+def encode_answers(person: bytes) -> int:
+    mask = 0
+    for c in person:
+        mask |= ANSWER_BITS[c]
+
+    return mask
+
+
+def get_group_masks(group: List[bytes]) -> Tuple[int, int]:
+    # Returns the questions answered by anyone and by everyone in the group
+    anyone, everyone = 0, ALL_ANSWERS
+    for person in group:
+        answers = encode_answers(person)
+        anyone |= answers
+        everyone &= answers
+
+    return anyone, everyone
+
+
+def count_answers(path: str) -> Tuple[int, int]:
+    # Sums the per-group "anyone" and "everyone" counts in one streaming pass,
+    # so only the group being looked at is ever in memory
+    anyone_total, everyone_total = 0, 0
+    for group in iter_records(path):
+        anyone, everyone = get_group_masks(group)
+        anyone_total += bin(anyone).count('1')
+        everyone_total += bin(everyone).count('1')
+
+    return anyone_total, everyone_total
+
+
+def parse_input(path: str = INPUT_PATH) -> str:
+    # Groups are read a record at a time while they're being counted
+    return path
+
+
+def pt1_solution(path: str) -> int:
+    return count_answers(path)[0]
+
+
+def pt2_solution(path: str) -> int:
+    return count_answers(path)[1]
+
+
+if __name__ == "__main__":
+    anyone_total, everyone_total = count_answers(parse_input())
+    print(f'Part 1: {anyone_total}')
+    print(f'Part 2: {everyone_total}')
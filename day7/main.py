@@ -1,20 +1,22 @@
+import os
 import re
 
-from collections import defaultdict, deque
-from typing import List, Set, Tuple
+from array import array
+from functools import cached_property
+from typing import Dict, Iterable, List, Tuple
 
 
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
 EMPTY_BAG = 'no other bags'
 INPUT_REGEX = re.compile(r'(?P<bag_type>[\w ]+) bags contain (?P<contents>.+)\.$')
 CONTENT_REGEX = re.compile(r'(?P<count>\d+) (?P<bag_type>[\w ]+) bags?')
 
-# Use two graphs because I'm too lazy to implement a bidirectional graph that
-# works for key -> list(values). We'll use one for part 1, one for part 2.
-contains_graph = defaultdict(list)
-contained_by_graph = defaultdict(list)
-
-# Used for part 2; correlates with contains_graph
-weights = {}
+# A rule: the bag type, and the (count, bag type) pairs it directly contains
+Rule = Tuple[str, List[Tuple[int, str]]]
+# Per-node (offsets, neighbour ids, edge weights) arrays; node i's neighbours
+# are neighbour_ids[offsets[i]:offsets[i + 1]]
+Adjacency = Tuple[array, array, array]
 
 
 def parse_bag_contents(content: str) -> Tuple[int, str]:
@@ -22,47 +24,150 @@ def parse_bag_contents(content: str) -> Tuple[int, str]:
     return int(match.group('count')), match.group('bag_type')
 
 
-def populate_graphs(lines: List[str]):
-    for line in lines:
-        match = INPUT_REGEX.match(line)
-        bag_type = match.group('bag_type')
-        contents = match.group('contents')
-
-        if contents == EMPTY_BAG:
-            continue
-
-        for count, contained_bag_type in map(parse_bag_contents, contents.split(', ')):
-            contained_by_graph[contained_bag_type].append(bag_type)
-
-            contains_graph[bag_type].append(contained_bag_type)
-            weights[(bag_type, contained_bag_type)] = count
-
-
-with open('input') as input_file:
-    lines = [l.strip() for l in input_file]
-
-populate_graphs(lines)
-
-seen_bag_types = set()
-bags_to_process = deque(contained_by_graph['shiny gold'])
-
-while bags_to_process:
-    bag_type = bags_to_process.popleft()
-    bags_to_process.extend(contained_by_graph[bag_type])
-    seen_bag_types.add(bag_type)
-
-print(f'Part 1: {len(seen_bag_types)}')
-
-bags_to_process = deque([('shiny gold', 1)])
-total = 0
-
-# Basically: add bag amounts as you traverse, while propagating the "bag multiplier" (how many bags this bag is in)
-while bags_to_process:
-    bag_type, multiplier = bags_to_process.popleft()
-
-    for contained_bag_type in contains_graph[bag_type]:
-        bag_count = weights[(bag_type, contained_bag_type)]
-        bags_to_process.append((contained_bag_type, multiplier * bag_count))
-        total += multiplier * bag_count
-
-print(f'Part 2: {total}')
+def parse_rule(line: str) -> Rule:
+    match = INPUT_REGEX.match(line)
+    contents = match.group('contents')
+    if contents == EMPTY_BAG:
+        return match.group('bag_type'), []
+
+    return match.group('bag_type'), list(map(parse_bag_contents, contents.split(', ')))
+
+
+def build_adjacency(node_count: int, edges: List[Tuple[int, int, int]]) -> Adjacency:
+    # Buckets (from, to, weight) edges by their from node
+    offsets = array('q', [0] * (node_count + 1))
+    for from_id, _, _ in edges:
+        offsets[from_id + 1] += 1
+    for node_id in range(node_count):
+        offsets[node_id + 1] += offsets[node_id]
+
+    neighbour_ids = array('q', [0] * len(edges))
+    weights = array('q', [0] * len(edges))
+    next_slots = offsets[:-1]
+    for from_id, to_id, weight in edges:
+        slot = next_slots[from_id]
+        neighbour_ids[slot] = to_id
+        weights[slot] = weight
+        next_slots[from_id] += 1
+
+    return offsets, neighbour_ids, weights
+
+
+class BagGraph:
+    """
+    The bag rules as a graph: bag names are interned to ids 0..n-1, and the
+    "contains" edges are stored in compact adjacency arrays. Every traversal
+    walks the bags once in topological order, memoizing per bag, so queries
+    cost time proportional to the size of the graph rather than to the
+    number of paths through it.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+        edges = []
+        for bag_type, contents in rules:
+            container_id = self.intern(bag_type)
+            for count, contained_bag_type in contents:
+                edges.append((container_id, self.intern(contained_bag_type), count))
+
+        self.contains = build_adjacency(len(self.names), edges)
+
+    def intern(self, bag_type: str) -> int:
+        bag_id = self.ids.get(bag_type)
+        if bag_id is None:
+            bag_id = self.ids[bag_type] = len(self.names)
+            self.names.append(bag_type)
+
+        return bag_id
+
+    @cached_property
+    def topological_order(self) -> List[int]:
+        # Bag ids ordered so that every bag comes before the bags it contains
+        offsets, contained_ids, _ = self.contains
+        in_degrees = [0] * len(self.names)
+        for contained_id in contained_ids:
+            in_degrees[contained_id] += 1
+
+        order = [bag_id for bag_id, in_degree in enumerate(in_degrees) if not in_degree]
+        for bag_id in order:
+            for contained_id in contained_ids[offsets[bag_id]:offsets[bag_id + 1]]:
+                in_degrees[contained_id] -= 1
+                if not in_degrees[contained_id]:
+                    order.append(contained_id)
+
+        if len(order) != len(self.names):
+            raise ValueError('Bag rules contain a cycle')
+
+        return order
+
+    @cached_property
+    def content_counts(self) -> List[int]:
+        # How many bags each bag holds in total, filled in innermost bags first
+        offsets, contained_ids, counts = self.contains
+        totals = [0] * len(self.names)
+        for bag_id in reversed(self.topological_order):
+            total = 0
+            for edge_idx in range(offsets[bag_id], offsets[bag_id + 1]):
+                total += counts[edge_idx] * (1 + totals[contained_ids[edge_idx]])
+            totals[bag_id] = total
+
+        return totals
+
+    def count_contents(self, bag_type: str) -> int:
+        # How many bags a bag of this type holds
+        return self.content_counts[self.ids[bag_type]]
+
+    def count_contents_batch(self, bag_types: Iterable[str]) -> List[int]:
+        return [self.count_contents(bag_type) for bag_type in bag_types]
+
+    def count_containers_batch(self, bag_types: Iterable[str]) -> List[int]:
+        # How many bag types can eventually contain each of the given types. All
+        # queries share one walk from the innermost bags outwards: each bag
+        # gets a mask with bit i set if it can contain the i-th queried bag,
+        # and then every set bit is tallied.
+        query_bits = [0] * len(self.names)
+        query_count = 0
+        for bag_type in bag_types:
+            query_bits[self.ids[bag_type]] |= 1 << query_count
+            query_count += 1
+
+        offsets, contained_ids, _ = self.contains
+        reachable = [0] * len(self.names)
+        for bag_id in reversed(self.topological_order):
+            mask = 0
+            for contained_id in contained_ids[offsets[bag_id]:offsets[bag_id + 1]]:
+                mask |= reachable[contained_id] | query_bits[contained_id]
+            reachable[bag_id] = mask
+
+        counts = [0] * query_count
+        for mask in reachable:
+            while mask:
+                lowest_bit = mask & -mask
+                counts[lowest_bit.bit_length() - 1] += 1
+                mask ^= lowest_bit
+
+        return counts
+
+    def count_containers(self, bag_type: str) -> int:
+        return self.count_containers_batch([bag_type])[0]
+
+
+def parse_input(path: str = INPUT_PATH) -> BagGraph:
+    with open(path) as input_file:
+        return BagGraph(parse_rule(l.strip()) for l in input_file if l.strip())
+
+
+def pt1_solution(graph: BagGraph) -> int:
+    return graph.count_containers('shiny gold')
+
+
+def pt2_solution(graph: BagGraph) -> int:
+    return graph.count_contents('shiny gold')
+
+
+if __name__ == "__main__":
+    graph = parse_input()
+    print(f'Part 1: {pt1_solution(graph)}')
+    print(f'Part 2: {pt2_solution(graph)}')
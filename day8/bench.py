@@ -0,0 +1,61 @@
+import argparse
+import time
+
+from typing import Callable, List, Tuple, TypeVar
+
+from aoc.generators import DEFAULT_SEED, generate_input
+from day8.main import CompiledProgram, OpCode, decode_chunk, interpret_instructions, parse_instruction
+
+
+T = TypeVar('T')
+
+DEFAULT_INSTRUCTION_COUNT = 1_000_000
+# generate_day8 lays out this many instructions per unit of scale
+INSTRUCTIONS_PER_SCALE = 650
+
+
+def generate_program_text(instruction_count: int, seed: int) -> bytes:
+    scale = -(-instruction_count // INSTRUCTIONS_PER_SCALE)
+    return generate_input(8, scale, seed).encode()
+
+
+def parse_instructions(text: bytes) -> List[Tuple[OpCode, int]]:
+    return [parse_instruction(l) for l in text.split(b'\n') if l]
+
+
+def time_call(func: Callable[[], T]) -> Tuple[T, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    # Compares the reference interpreter with the compiled engine on a
+    # synthetic looping program, e.g. python -m day8.bench --instructions 1000000
+    parser = argparse.ArgumentParser(description='Benchmark the day 8 interpreters')
+    parser.add_argument('--instructions', type=int, default=DEFAULT_INSTRUCTION_COUNT)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    # Both sides are timed from the program's text, so the compiled engine's
+    # decoding and compiling count against it just like the reference
+    # interpreter's parsing does
+    text = generate_program_text(args.instructions, args.seed)
+    instructions, parse_time = time_call(lambda: parse_instructions(text))
+    (accumulator, _), reference_time = time_call(lambda: interpret_instructions(instructions))
+    program, decode_time = time_call(lambda: decode_chunk(text))
+    compiled, compile_time = time_call(lambda: CompiledProgram(program))
+    stats, run_time = time_call(compiled.run)
+    assert accumulator == stats.accumulator
+
+    reference_total = parse_time + reference_time
+    compiled_total = decode_time + compile_time + run_time
+    print(f'{len(instructions)} instructions, {stats.steps} steps before looping at {stats.loop_entry}')
+    print(f'reference: {reference_total:.3f}s ({parse_time:.3f}s parse, {reference_time:.3f}s run at '
+          f'{stats.steps / reference_time / 1e6:.1f}M instructions/s)')
+    print(f'compiled:  {compiled_total:.3f}s ({decode_time:.3f}s decode, {compile_time:.3f}s compile, '
+          f'{run_time:.3f}s run at {stats.steps / run_time / 1e6:.1f}M instructions/s)')
+    print(f'speedup:   {reference_total / compiled_total:.1f}x end to end, {reference_time / run_time:.1f}x running')
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
-from collections import deque
+import numpy as np
+import os
+
+from array import array
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from aoc.inputs import iter_chunks
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
 
 
 class OpCode(Enum):
@@ -9,20 +18,16 @@ class OpCode(Enum):
     NOOP = 'nop'
 
 
-def invert_instruction(opcode: OpCode, arg: int) -> Tuple[OpCode, int]:
-    if opcode == OpCode.JUMP:
-        return OpCode.NOOP, arg
-    elif opcode == OpCode.NOOP:
-        return OpCode.JUMP, arg
-    return opcode, arg
+ACCUMULATOR_CODE, JUMP_CODE, NOOP_CODE = range(3)
+# An instruction's opcode code, looked up by the first byte of its line
+OPCODE_CODE_TABLE = np.full(256, -1, dtype=np.int8)
+OPCODE_CODE_TABLE[[ord('a'), ord('j'), ord('n')]] = ACCUMULATOR_CODE, JUMP_CODE, NOOP_CODE
+# What flipping each opcode code turns it into (acc stays acc)
+FLIPPED_CODES = (ACCUMULATOR_CODE, NOOP_CODE, JUMP_CODE)
 
 
-def invert_instructions_at_idx(instructions: List[Tuple[OpCode, int]], idx: int) -> List[Tuple[OpCode, int]]:
-    instructions[idx] = invert_instruction(*instructions[idx])
-    return instructions
-
-
-def execute_instructions(instructions: List[Tuple[OpCode, int]]) -> Tuple[int, bool]:
+def interpret_instructions(instructions: List[Tuple[OpCode, int]]) -> Tuple[int, bool]:
+    # Reference interpreter that steps through one instruction at a time.
     # Returns the accumulator up until escape (either through infinite-loop
     # detection, or finishing execution), and whether or not the program
     # successfully completes.
@@ -47,27 +52,223 @@ def execute_instructions(instructions: List[Tuple[OpCode, int]]) -> Tuple[int, b
     return accumulator, instr_idx == len(instructions)
 
 
-instructions: List[Tuple[str, int]]
-with open('input') as input_file:
-    instructions = [(OpCode(l[0:3]), int(l[4:])) for l in input_file]
+@dataclass
+class Program:
+    """
+    A program as one array of opcode codes and one of arguments, decoded
+    straight from the input's bytes.
+    """
 
-print(f'Part 1: {execute_instructions(instructions)[0]}')
+    opcodes: np.ndarray  # int8 opcode codes
+    args: np.ndarray  # int64
 
-# Just bruteforce part 2 since backtracking looks hella ugly
-for idx in range(len(instructions)):
-    opcode, arg = instructions[idx]
-    if opcode == OpCode.ACCUMULATOR:
-        continue
+    def flipped_at(self, idx: int) -> 'Program':
+        opcodes = self.opcodes.copy()
+        opcodes[idx] = FLIPPED_CODES[opcodes[idx]]
+        return Program(opcodes, self.args)
 
-    # Try the program as is first, then try it with the current instruction
-    # inverted.
-    accumulator, completed = execute_instructions(instructions)
-    if not completed:
-        invert_instructions_at_idx(instructions, idx)
-        accumulator, completed = execute_instructions(instructions)
-        if not completed:
-            invert_instructions_at_idx(instructions, idx)
-    
-    if completed:
-        print(f'Part 2: {accumulator}')
-        break
+
+def decode_chunk(chunk: bytes) -> Program:
+    # Decodes every 'op +arg' line in the chunk at once: the opcode comes from
+    # each line's first byte, and the arguments are parsed one digit position
+    # (counting from the end of the line) at a time across every line
+    data = np.frombuffer(chunk if chunk.endswith(b'\n') else chunk + b'\n', dtype=np.uint8)
+    line_ends = np.flatnonzero(data == ord('\n'))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    non_blank = line_ends > line_starts
+    line_starts, line_ends = line_starts[non_blank], line_ends[non_blank]
+
+    opcodes = OPCODE_CODE_TABLE[data[line_starts]]
+    if (opcodes < 0).any():
+        bad_start = line_starts[np.argmax(opcodes < 0)]
+        raise ValueError(f'Unknown opcode {bytes(data[bad_start:bad_start + 3]).decode()!r}')
+
+    signs = data[line_starts + 4]
+    has_sign = (signs == ord('+')) | (signs == ord('-'))
+    digit_counts = line_ends - line_starts - 4 - has_sign
+    args = np.zeros(len(line_starts), dtype=np.int64)
+    place_value = 1
+    for digit in range(digit_counts.max(initial=0)):
+        # The digit `digit` places in from the end of each line, or 0 for
+        # lines whose argument is shorter than that
+        digit_values = data[line_ends - 1 - digit].astype(np.int64) - ord('0')
+        args += np.where(digit_counts > digit, digit_values, 0) * place_value
+        place_value *= 10
+
+    return Program(opcodes, np.where(signs == ord('-'), -args, args))
+
+
+def decode_program(path: str) -> Program:
+    chunks = [decode_chunk(chunk) for chunk in iter_chunks(path)]
+    return Program(
+        np.concatenate([c.opcodes for c in chunks] or [np.zeros(0, dtype=np.int8)]),
+        np.concatenate([c.args for c in chunks] or [np.zeros(0, dtype=np.int64)]),
+    )
+
+
+@dataclass
+class ExecutionStats:
+    accumulator: int
+    finished: bool
+    steps: int  # Instructions executed
+    loop_entry: Optional[int]  # The first instruction that would have run twice, if the program looped
+
+
+class CompiledProgram:
+    """
+    A program decoded into flat arrays and split into basic blocks: a run of
+    acc/nop instructions plus the jmp that ends it. Running the rest of a block
+    from any of its instructions is a single superinstruction, which adds that
+    instruction's precomputed accumulator suffix and moves on to the block's
+    precomputed jump target.
+    """
+
+    def __init__(self, program: Program):
+        opcodes, args = program.opcodes, program.args
+
+        # Every jmp ends a block, and so does the last instruction
+        is_block_end = opcodes == JUMP_CODE
+        is_block_end[-1:] = True
+        block_ids = np.cumsum(is_block_end) - is_block_end
+        block_ends = np.flatnonzero(is_block_end)
+        block_targets = np.where(opcodes[block_ends] == JUMP_CODE, block_ends + args[block_ends], block_ends + 1)
+
+        # What the accumulator gains running from each instruction to the end
+        # of its block
+        acc_args = np.where(opcodes == ACCUMULATOR_CODE, args, 0)
+        acc_totals = np.cumsum(acc_args)
+        acc_suffixes = acc_totals[block_ends[block_ids]] - acc_totals + acc_args
+
+        self.opcodes = array('b', opcodes.tobytes())
+        self.args = array('q', args.tobytes())
+        self.block_ids = array('q', block_ids.astype(np.int64).tobytes())
+        self.block_ends = array('q', block_ends.astype(np.int64).tobytes())
+        self.block_targets = array('q', block_targets.astype(np.int64).tobytes())
+        self.acc_suffixes = array('q', acc_suffixes.astype(np.int64).tobytes())
+
+    def run(self) -> ExecutionStats:
+        # Runs until the program finishes, jumps outside of itself, or is about
+        # to run an instruction for the second time. Every block always runs
+        # through to its jmp, so entering an already visited block means the
+        # program is looping: either at the new entry point, or (if it entered
+        # earlier in the block this time) at the old one.
+        instruction_count = len(self.opcodes)
+        block_ids, block_ends, block_targets, acc_suffixes = self.block_ids, self.block_ends, self.block_targets, self.acc_suffixes
+        visited_blocks = bytearray(len(block_ends))
+        block_entries = array('q', bytes(8 * len(block_ends)))
+
+        accumulator = 0
+        steps = 0
+        instr_idx = 0
+        while 0 <= instr_idx < instruction_count:
+            block_id = block_ids[instr_idx]
+            if visited_blocks[block_id]:
+                loop_entry = max(instr_idx, block_entries[block_id])
+                accumulator += acc_suffixes[instr_idx] - acc_suffixes[loop_entry]
+                steps += loop_entry - instr_idx
+                return ExecutionStats(accumulator, False, steps, loop_entry)
+
+            visited_blocks[block_id] = 1
+            block_entries[block_id] = instr_idx
+            accumulator += acc_suffixes[instr_idx]
+            steps += block_ends[block_id] - instr_idx + 1
+            instr_idx = block_targets[block_id]
+
+        return ExecutionStats(accumulator, instr_idx == instruction_count, steps, None)
+
+
+def execute_instructions(program: Program) -> Tuple[int, bool]:
+    # Returns the accumulator up until escape, and whether or not the program
+    # successfully completes
+    stats = CompiledProgram(program).run()
+    return stats.accumulator, stats.finished
+
+
+def get_next_idx(opcode: int, arg: int, idx: int) -> int:
+    return idx + arg if opcode == JUMP_CODE else idx + 1
+
+
+def get_finishing_instructions(opcodes: List[int], args: List[int]) -> bytearray:
+    # Flags every instruction that, when execution reaches it, leads to the
+    # program finishing (landing exactly one past the last instruction).
+    # Control flow only ever has one way out of an instruction, so each
+    # instruction's path is followed until it meets one whose outcome is
+    # already known (or loops back on itself), and the whole path shares that
+    # outcome; every instruction is walked once.
+    UNKNOWN, ON_PATH, FINISHES, FAILS = range(4)
+    instruction_count = len(opcodes)
+    outcomes = bytearray(instruction_count + 1)
+    outcomes[instruction_count] = FINISHES
+
+    for start_idx in range(instruction_count):
+        path = []
+        instr_idx = start_idx
+        while 0 <= instr_idx <= instruction_count and outcomes[instr_idx] == UNKNOWN:
+            outcomes[instr_idx] = ON_PATH
+            path.append(instr_idx)
+            instr_idx = get_next_idx(opcodes[instr_idx], args[instr_idx], instr_idx)
+
+        # Jumping outside the program (other than to its end) counts as failing
+        in_range = 0 <= instr_idx <= instruction_count
+        outcome = outcomes[instr_idx] if in_range and outcomes[instr_idx] != ON_PATH else FAILS
+        for path_idx in path:
+            outcomes[path_idx] = outcome
+
+    return bytearray(outcome == FINISHES for outcome in outcomes[:instruction_count])
+
+
+def find_repair(program: Program) -> Optional[int]:
+    # Returns the index of the jmp/nop whose flip makes the program finish, or
+    # None if it already does. Only instructions the broken program executes
+    # can matter, and flipping one of them works iff its new successor is an
+    # instruction that finishes (the broken run never reaches one, so the
+    # repaired run can't come back around to the flip). Like trying every flip
+    # in order, the lowest such index wins.
+    opcodes, args = program.opcodes.tolist(), program.args.tolist()
+    instruction_count = len(opcodes)
+    finishes = get_finishing_instructions(opcodes, args) + b'\x01'
+    if finishes[0]:
+        return None
+
+    executed = bytearray(instruction_count)
+    instr_idx = 0
+    while 0 <= instr_idx < instruction_count and not executed[instr_idx]:
+        executed[instr_idx] = 1
+        instr_idx = get_next_idx(opcodes[instr_idx], args[instr_idx], instr_idx)
+
+    for instr_idx in range(instruction_count):
+        opcode = opcodes[instr_idx]
+        if not executed[instr_idx] or opcode == ACCUMULATOR_CODE:
+            continue
+
+        flipped_next_idx = get_next_idx(FLIPPED_CODES[opcode], args[instr_idx], instr_idx)
+        if 0 <= flipped_next_idx <= instruction_count and finishes[flipped_next_idx]:
+            return instr_idx
+
+    raise ValueError('No single jmp/nop flip makes the program finish')
+
+
+def parse_instruction(line: bytes) -> Tuple[OpCode, int]:
+    return OpCode(line[0:3].decode()), int(line[4:])
+
+
+def parse_input(path: str = INPUT_PATH) -> Program:
+    return decode_program(path)
+
+
+def pt1_solution(program: Program) -> int:
+    return execute_instructions(program)[0]
+
+
+def pt2_solution(program: Program) -> int:
+    repair_idx = find_repair(program)
+    if repair_idx is not None:
+        program = program.flipped_at(repair_idx)
+
+    return execute_instructions(program)[0]
+
+
+if __name__ == "__main__":
+    program = parse_input()
+    print(f'Part 1: {pt1_solution(program)}')
+    print(f'Part 2: {pt2_solution(program)}')
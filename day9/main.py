@@ -1,34 +1,98 @@
-from typing import Set
+import os
 
+from collections import Counter, deque
+from itertools import islice
+from typing import Collection, Iterable, Optional
 
-def has_sum_pair(nums: Set[int], sum: int) -> bool:
+from aoc.inputs import InputInts
+
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), 'input')
+
+PREAMBLE_SIZE = 25
+
+
+def has_sum_pair(nums: Collection[int], total: int) -> bool:
     # Special case: a number is exactly half of the sum
-    return any((sum - n in nums) and n * 2 != sum for n in nums)
-
-
-with open('input') as input_file:
-    input = [int(l.strip()) for l in input_file.readlines()]
-
-preamble_size = 25
-invalid_number = -1
-for idx, num in enumerate(input[preamble_size:], preamble_size):
-    if not has_sum_pair(set(input[idx - preamble_size:idx]), num):
-        invalid_number = num
-        print(f'Part 1: {invalid_number}')
-        break
-
-left_window_idx = 0
-right_window_idx = 0
-window_sum = input[left_window_idx]
-
-# Expand window (and keep track of sum) until we hit/surpass the invalid number
-while window_sum != invalid_number:
-    if window_sum > invalid_number:
-        left_window_idx += 1
-        window_sum -= input[left_window_idx - 1]
-    elif window_sum < invalid_number:
-        right_window_idx += 1
-        window_sum += input[right_window_idx]
-
-window = input[left_window_idx:right_window_idx+1]
-print(f'Part 2: {min(window) + max(window)}')
\ No newline at end of file
+    return any((total - n in nums) and n * 2 != total for n in nums)
+
+
+def find_invalid_number(nums: Iterable[int], preamble_size: int = PREAMBLE_SIZE) -> Optional[int]:
+    # Returns the first number that isn't the sum of two different numbers
+    # among the preamble_size numbers before it. The window is kept as a
+    # multiset that's updated as it slides, so the stream is never held in
+    # memory and nothing gets rebuilt per number.
+    window = deque()
+    window_counts = Counter()
+    for num in nums:
+        if len(window) == preamble_size:
+            if not has_sum_pair(window_counts, num):
+                return num
+
+            oldest = window.popleft()
+            window_counts[oldest] -= 1
+            if not window_counts[oldest]:
+                del window_counts[oldest]
+
+        window.append(num)
+        window_counts[num] += 1
+
+    return None
+
+
+def find_weakness(nums: Iterable[int], target: int) -> Optional[int]:
+    # Finds a run of at least two contiguous numbers summing to target and
+    # returns its smallest plus largest number. nums has to be re-iterable
+    # (e.g. InputInts): numbers are positive, so the run only grows at the
+    # right and shrinks at the left, and a second iterator trailing the first
+    # one gives back each number as it leaves the run. Once the run is found
+    # the trailing iterator is sitting at its start, so reading on from it
+    # gives the run's min and max; memory stays constant however long the run
+    # gets.
+    trailing_nums = iter(nums)
+    if trailing_nums is nums:
+        raise ValueError('find_weakness needs to iterate over nums more than once')
+
+    window_sum = 0
+    first_idx = 0
+
+    for idx, num in enumerate(nums):
+        window_sum += num
+        while first_idx <= idx and window_sum > target:
+            window_sum -= next(trailing_nums)
+            first_idx += 1
+
+        if window_sum == target and idx - first_idx >= 1:
+            run = islice(trailing_nums, idx - first_idx + 1)
+            smallest = largest = next(run)
+            for run_num in run:
+                smallest = min(smallest, run_num)
+                largest = max(largest, run_num)
+
+            return smallest + largest
+
+    return None
+
+
+def parse_input(path: str = INPUT_PATH) -> Iterable[int]:
+    return InputInts(path)
+
+
+def pt1_solution(nums: Iterable[int], preamble_size: int = PREAMBLE_SIZE) -> Optional[int]:
+    # None if every number in the stream is valid
+    return find_invalid_number(nums, preamble_size)
+
+
+def pt2_solution(nums: Iterable[int], preamble_size: int = PREAMBLE_SIZE) -> Optional[int]:
+    # There's no weakness to look for when there's no invalid number
+    invalid_number = pt1_solution(nums, preamble_size)
+    if invalid_number is None:
+        return None
+
+    return find_weakness(nums, invalid_number)
+
+
+if __name__ == "__main__":
+    nums = parse_input()
+    print(f'Part 1: {pt1_solution(nums)}')
+    print(f'Part 2: {pt2_solution(nums)}')